@@ -1,15 +1,19 @@
 import os
+import atexit
 from flask import Flask, send_file
 from flask_cors import CORS
 from config import Config
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from routes.api.authentification.authentification import auth_bp
 from routes.api.rankings.rankings import rankings_bp
 from routes.admin.admin import admin_bp
 from models import db, Player
-from utils.logging_config import setup_logging
-from tasks.scheduler import start_scheduler, trigger_manual_update
+from utils.logging_config import setup_logging, init_request_logging
+from tasks.scheduler import start_scheduler, stop_scheduler, trigger_manual_update
+from tasks.runner import init_runner
+from tasks.data_version import poll_versions
 
 
 
@@ -18,6 +22,10 @@ def create_app():
     app = Flask(__name__, static_folder='build', static_url_path='')
     app.config.from_object(Config)
 
+    # request.remote_addr = the address the trusted proxy saw (rate limiting keys on it)
+    if Config.TRUSTED_PROXY_HOPS:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXY_HOPS)
+
     # Environment-based CORS configuration
     is_development = (
         app.config.get('DEBUG') or 
@@ -55,6 +63,15 @@ def create_app():
     # Database initialization
     db.init_app(app)
     migrate = Migrate(app, db)
+
+    # Background jobs run in their own app context (tasks/runner.py)
+    init_runner(app)
+
+    # Drop cached data another worker has replaced (tasks/data_version.py)
+    app.before_request(poll_versions)
+
+    # Request id + timing on every record logged during a request
+    init_request_logging(app)
     
     # Blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -98,8 +115,10 @@ def initialize_app_services(app, is_development):
         
         if not is_development:
             # Only start scheduler in production
+            # Every process joins the election; only the leader runs jobs
             print("Starting scheduler...")
-            start_scheduler()
+            start_scheduler(app)
+            atexit.register(stop_scheduler)
             print("✅ Scheduler started")
         else:
             print("⚠️ Scheduler disabled in development mode")
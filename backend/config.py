@@ -11,4 +11,94 @@ class Config:
     JWT_SECRET = os.environ.get("JWT_SECRET")
     GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
+    # Google endpoints can point at a local stand-in (scripts/oauth_standin.py)
+    GOOGLE_AUTH_URI = os.environ.get("GOOGLE_AUTH_URI", "https://accounts.google.com/o/oauth2/auth")
+    GOOGLE_TOKEN_URI = os.environ.get("GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token")
+    GOOGLE_CERTS_URI = os.environ.get("GOOGLE_CERTS_URI", "https://www.googleapis.com/oauth2/v1/certs")
+    GOOGLE_USERINFO_URI = os.environ.get("GOOGLE_USERINFO_URI", "https://www.googleapis.com/oauth2/v2/userinfo")
+    GOOGLE_REDIRECT_URI = os.environ.get("GOOGLE_REDIRECT_URI", "http://localhost:3000/auth/callback")
+    GOOGLE_CERTS_TTL_SECONDS = int(os.environ.get("GOOGLE_CERTS_TTL_SECONDS", 3600))
+    GOOGLE_HTTP_POOL_SIZE = int(os.environ.get("GOOGLE_HTTP_POOL_SIZE", 10))
     DEBUG = os.environ.get("FLASK_DEBUG", "False").lower() == "true"
+
+    # Scraping
+    PARSER_STATE_FILE = os.environ.get("PARSER_STATE_FILE") or "instance/parser_state.json"
+
+    # Logging: records go through a bounded queue to one writer thread;
+    # LOG_FORMAT=json writes JSON lines (with request id and duration)
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+    LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+    # Rotated logs: compressed in blocks, kept until too old or too large in total
+    LOG_ARCHIVE_DIR = os.environ.get("LOG_ARCHIVE_DIR") or "logs/archive"
+    LOG_ARCHIVE_BLOCK_KB = int(os.environ.get("LOG_ARCHIVE_BLOCK_KB", 256))
+    LOG_ARCHIVE_MAX_MB = int(os.environ.get("LOG_ARCHIVE_MAX_MB", 200))
+    LOG_ARCHIVE_MAX_DAYS = int(os.environ.get("LOG_ARCHIVE_MAX_DAYS", 30))
+
+    # Admin log endpoints: line counts / offsets per log file
+    LOG_INDEX_FILE = os.environ.get("LOG_INDEX_FILE") or "instance/log_index.json"
+    LOG_TIME_INDEX_FILE = os.environ.get("LOG_TIME_INDEX_FILE") or "instance/log_time_index.json"
+    # Live follow (SSE): stat polling for writes from other processes, and
+    # stream length before the client reconnects with its cursor
+    LOG_FOLLOW_POLL_SECONDS = float(os.environ.get("LOG_FOLLOW_POLL_SECONDS", 1.0))
+    LOG_FOLLOW_MAX_SECONDS = int(os.environ.get("LOG_FOLLOW_MAX_SECONDS", 300))
+
+    # Scheduler: one leader across all processes, jobs stored in the database
+    SCHEDULER_LOCK_TTL_SECONDS = int(os.environ.get("SCHEDULER_LOCK_TTL_SECONDS", 60))
+    SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.environ.get("SCHEDULER_MISFIRE_GRACE_SECONDS", 6 * 3600))
+
+    # Background jobs: threads per pool (scheduled jobs / on-demand jobs)
+    JOB_RUNNER_WORKERS = int(os.environ.get("JOB_RUNNER_WORKERS", 4))
+
+    # Publish detection: probe from Monday morning (GMT) until new rankings appear
+    PUBLISH_WINDOW_DAY = os.environ.get("PUBLISH_WINDOW_DAY", "mon")
+    PUBLISH_WINDOW_START_HOUR = int(os.environ.get("PUBLISH_WINDOW_START_HOUR", 6))
+    PUBLISH_WINDOW_HOURS = int(os.environ.get("PUBLISH_WINDOW_HOURS", 48))
+    PROBE_BASE_MINUTES = int(os.environ.get("PROBE_BASE_MINUTES", 15))
+    PROBE_MAX_MINUTES = int(os.environ.get("PROBE_MAX_MINUTES", 240))
+
+    # Manual and scheduled scrapes share a cross-process lock, held for at most this long
+    SCRAPE_LOCK_TTL_SECONDS = int(os.environ.get("SCRAPE_LOCK_TTL_SECONDS", 15 * 60))
+
+    # Player profile enrichment
+    # Each worker drives its own headless Chrome (atptour.com is behind Cloudflare)
+    PROFILE_WORKERS = int(os.environ.get("PROFILE_WORKERS", 2))
+    PROFILE_PAGE_TIMEOUT_SECONDS = int(os.environ.get("PROFILE_PAGE_TIMEOUT_SECONDS", 25))
+    PROFILE_MIN_INTERVAL_SECONDS = float(os.environ.get("PROFILE_MIN_INTERVAL_SECONDS", 1.0))
+    PROFILE_STALE_DAYS = int(os.environ.get("PROFILE_STALE_DAYS", 30))
+
+    # Rankings cache: serve the previous page this long while one request rebuilds it
+    RANKINGS_STALE_SECONDS = int(os.environ.get("RANKINGS_STALE_SECONDS", 30))
+
+    # How often each process checks whether another process changed cached data
+    DATA_VERSION_POLL_SECONDS = float(os.environ.get("DATA_VERSION_POLL_SECONDS", 2.0))
+
+    # Route caches: "memory" (this process) or "redis" (shared by every node)
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_URL = os.environ.get("CACHE_URL")
+    CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "pr2:")
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 2048))
+    CACHE_DEFAULT_TTL_SECONDS = int(os.environ.get("CACHE_DEFAULT_TTL_SECONDS", 7 * 24 * 3600))
+
+    # Password hashing: bcrypt cost, hashing threads (0 = one per CPU) and
+    # how many logins may wait for a thread before new ones get a 503
+    BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.environ.get("BCRYPT_WORKERS", 0))
+    BCRYPT_MAX_PENDING = int(os.environ.get("BCRYPT_MAX_PENDING", 32))
+
+    # Access tokens are short-lived; refresh tokens renew them without a login
+    ACCESS_TOKEN_MINUTES = int(os.environ.get("ACCESS_TOKEN_MINUTES", 15))
+    REFRESH_TOKEN_DAYS = int(os.environ.get("REFRESH_TOKEN_DAYS", 30))
+
+    # Verified JWTs remembered per process (skips signature checks on repeat requests)
+    TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 4096))
+
+    # Revoked access tokens kept in memory (Bloom filter sized for this many)
+    REVOCATION_CAPACITY = int(os.environ.get("REVOCATION_CAPACITY", 10000))
+
+    # Rate limits for login/signup/admin triggers ("memory" per process or "shared" cache)
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SHARDS = int(os.environ.get("RATE_LIMIT_SHARDS", 16))
+    # Proxies in front of the app that append to X-Forwarded-For (set to 1 in
+    # the Dockerfile for Railway); 0 = use the socket address
+    TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", 0))
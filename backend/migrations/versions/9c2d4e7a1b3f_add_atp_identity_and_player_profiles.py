@@ -0,0 +1,49 @@
+"""Add ATP identity to players and player_profiles table
+
+Revision ID: 9c2d4e7a1b3f
+Revises: 4e78be2b2e51
+Create Date: 2026-10-19 10:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c2d4e7a1b3f'
+down_revision = '4e78be2b2e51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 1. ATP id/slug from the profile link, nullable for rows scraped before this
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('atp_id', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('slug', sa.String(length=100), nullable=True))
+        batch_op.create_index(batch_op.f('ix_players_atp_id'), ['atp_id'], unique=False)
+
+    # 2. Profiles keyed by atp_id so they survive the weekly rankings replace
+    op.create_table('player_profiles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('atp_id', sa.String(length=20), nullable=False),
+        sa.Column('country', sa.String(length=60), nullable=True),
+        sa.Column('birth_date', sa.Date(), nullable=True),
+        sa.Column('height_cm', sa.Integer(), nullable=True),
+        sa.Column('plays', sa.String(length=80), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('player_profiles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_player_profiles_atp_id'), ['atp_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('player_profiles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_player_profiles_atp_id'))
+    op.drop_table('player_profiles')
+
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_players_atp_id'))
+        batch_op.drop_column('slug')
+        batch_op.drop_column('atp_id')
@@ -0,0 +1,29 @@
+"""Add data_versions table for cross-process cache invalidation
+
+Revision ID: a3e5c7f9b218
+Revises: f1c7d2e84a05
+Create Date: 2026-10-19 21:12:48.301547
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e5c7f9b218'
+down_revision = 'f1c7d2e84a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
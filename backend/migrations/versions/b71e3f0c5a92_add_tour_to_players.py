@@ -0,0 +1,63 @@
+"""Add tour to players for multi-source rankings
+
+Revision ID: b71e3f0c5a92
+Revises: 9c2d4e7a1b3f
+Create Date: 2026-10-19 14:03:54.118027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71e3f0c5a92'
+down_revision = '9c2d4e7a1b3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 1. Add tour as nullable, backfill existing rows (all ATP), then enforce
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tour', sa.String(length=10), nullable=True))
+
+    op.execute("UPDATE players SET tour = 'atp' WHERE tour IS NULL")
+
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.alter_column('tour', existing_type=sa.String(length=10), nullable=False)
+        batch_op.create_index(batch_op.f('ix_players_tour'), ['tour'], unique=False)
+
+        # 2. Rankings are unique per tour, not globally
+        batch_op.drop_index('ix_players_ranking')
+        batch_op.create_index(batch_op.f('ix_players_ranking'), ['ranking'], unique=False)
+        batch_op.create_unique_constraint('uq_players_tour_ranking', ['tour', 'ranking'])
+
+        # 3. atp_id becomes the source-neutral tour_player_id
+        batch_op.drop_index('ix_players_atp_id')
+        batch_op.alter_column('atp_id', new_column_name='tour_player_id',
+               existing_type=sa.String(length=20), existing_nullable=True)
+
+    # Index the renamed column in its own batch: within the batch above the
+    # new name doesn't exist yet (KeyError on SQLite)
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_players_tour_player_id'), ['tour_player_id'], unique=False)
+
+
+def downgrade():
+    # Non-ATP rows can't live in the single-tour schema
+    op.execute("DELETE FROM players WHERE tour <> 'atp'")
+
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_players_tour_player_id'))
+        batch_op.alter_column('tour_player_id', new_column_name='atp_id',
+               existing_type=sa.String(length=20), existing_nullable=True)
+
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.create_index('ix_players_atp_id', ['atp_id'], unique=False)
+
+        batch_op.drop_constraint('uq_players_tour_ranking', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_players_ranking'))
+        batch_op.create_index('ix_players_ranking', ['ranking'], unique=True)
+
+        batch_op.drop_index(batch_op.f('ix_players_tour'))
+        batch_op.drop_column('tour')
@@ -0,0 +1,31 @@
+"""Add scheduler_locks table for scheduler leader election
+
+Revision ID: d4a81c29e6f7
+Revises: b71e3f0c5a92
+Create Date: 2026-10-19 16:40:12.551903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a81c29e6f7'
+down_revision = 'b71e3f0c5a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # apscheduler_jobs is created by APScheduler's SQLAlchemyJobStore itself
+    op.create_table('scheduler_locks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('owner', sa.String(length=120), nullable=False),
+        sa.Column('acquired_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_locks')
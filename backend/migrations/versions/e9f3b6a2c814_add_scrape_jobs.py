@@ -0,0 +1,39 @@
+"""Add scrape_jobs table for asynchronous manual updates
+
+Revision ID: e9f3b6a2c814
+Revises: d4a81c29e6f7
+Create Date: 2026-10-19 18:21:47.093316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9f3b6a2c814'
+down_revision = 'd4a81c29e6f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scrape_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('state', sa.String(length=20), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=True),
+        sa.Column('tours', sa.String(length=100), nullable=True),
+        sa.Column('requested_by', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('scrape_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scrape_jobs_state'), ['state'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('scrape_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scrape_jobs_state'))
+    op.drop_table('scrape_jobs')
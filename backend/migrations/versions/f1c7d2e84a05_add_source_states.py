@@ -0,0 +1,32 @@
+"""Add source_states table for publish detection
+
+Revision ID: f1c7d2e84a05
+Revises: e9f3b6a2c814
+Create Date: 2026-10-19 20:05:33.674120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7d2e84a05'
+down_revision = 'e9f3b6a2c814'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('source_states',
+        sa.Column('tour', sa.String(length=10), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=True),
+        sa.Column('probe_etag', sa.String(length=200), nullable=True),
+        sa.Column('probe_last_modified', sa.String(length=100), nullable=True),
+        sa.Column('last_probe_at', sa.DateTime(), nullable=True),
+        sa.Column('last_ingest_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('tour')
+    )
+
+
+def downgrade():
+    op.drop_table('source_states')
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timezone
+from datetime import datetime, timezone, date
 
 
 # Initialize db
@@ -40,17 +40,201 @@ class User(db.Model):
 
 class Player(db.Model):
     __tablename__ = "players"
+    __table_args__ = (
+        # Each tour has its own 1-100
+        db.UniqueConstraint("tour", "ranking", name="uq_players_tour_ranking"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    ranking = db.Column(db.Integer, unique=True, nullable=False, index=True)  # 1-100
+    tour = db.Column(db.String(10), nullable=False, default="atp", index=True)  # atp / wta
+    ranking = db.Column(db.Integer, nullable=False, index=True)  # 1-100
     name = db.Column(db.String(100), nullable=False)
     points = db.Column(db.Integer, nullable=False)
     last_updated = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Identity on the tour's own site, mapped by the source adapter
+    # ATP: /en/players/<slug>/<tour_player_id>/overview
+    tour_player_id = db.Column(db.String(20), nullable=True, index=True)
+    slug = db.Column(db.String(100), nullable=True)
+
+    # Profiles outlive the weekly delete/insert of rankings rows,
+    # so they are joined on the ATP id rather than a foreign key
+    profile = db.relationship(
+        "PlayerProfile",
+        primaryjoin="and_(Player.tour == 'atp', "
+                    "foreign(Player.tour_player_id) == PlayerProfile.atp_id)",
+        uselist=False,
+        viewonly=True
+    )
     
     def to_dict(self):
         return {
             "id": self.id,
+            "tour": self.tour,
             "ranking": self.ranking,
             "name": self.name,
-            "points": self.points
-        }
\ No newline at end of file
+            "points": self.points,
+            "tour_player_id": self.tour_player_id,
+            "profile": self.profile.to_dict() if self.profile else None
+        }
+
+
+class PlayerProfile(db.Model):
+    __tablename__ = "player_profiles"
+
+    id = db.Column(db.Integer, primary_key=True)
+    atp_id = db.Column(db.String(20), unique=True, nullable=False, index=True)
+    country = db.Column(db.String(60), nullable=True)
+    birth_date = db.Column(db.Date, nullable=True)
+    height_cm = db.Column(db.Integer, nullable=True)
+    plays = db.Column(db.String(80), nullable=True)
+    fetched_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    @property
+    def age(self):
+        if not self.birth_date:
+            return None
+        today = date.today()
+        had_birthday = (today.month, today.day) >= (self.birth_date.month, self.birth_date.day)
+        return today.year - self.birth_date.year - (0 if had_birthday else 1)
+
+    def to_dict(self):
+        return {
+            "atp_id": self.atp_id,
+            "country": self.country,
+            "age": self.age,
+            "height_cm": self.height_cm,
+            "plays": self.plays
+        }
+
+class SchedulerLock(db.Model):
+    """
+    Lease-based lock shared by all app processes
+    Whoever holds the row (and keeps renewing it) runs the scheduler.
+    """
+    __tablename__ = "scheduler_locks"
+
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(120), nullable=False)
+    acquired_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "owner": self.owner,
+            "acquired_at": self.acquired_at.isoformat(),
+            "expires_at": self.expires_at.isoformat()
+        }
+
+
+class ScrapeJob(db.Model):
+    """
+    Status of an on-demand rankings update
+    Stored in the database so any worker can answer status polls.
+    """
+    __tablename__ = "scrape_jobs"
+
+    id = db.Column(db.String(32), primary_key=True)
+    state = db.Column(db.String(20), nullable=False, default="queued", index=True)  # queued / running / succeeded / failed
+    stage = db.Column(db.String(50), nullable=True)
+    tours = db.Column(db.String(100), nullable=True)  # comma separated, empty = all sources
+    requested_by = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_active(self):
+        return self.state in ("queued", "running")
+
+    def to_dict(self):
+        duration = None
+        if self.started_at:
+            end = self.finished_at or datetime.now(timezone.utc).replace(tzinfo=None)
+            duration = round((end - self.started_at.replace(tzinfo=None)).total_seconds(), 1)
+
+        return {
+            "id": self.id,
+            "state": self.state,
+            "stage": self.stage,
+            "tours": self.tours.split(",") if self.tours else [],
+            "requested_by": self.requested_by,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": duration
+        }
+
+
+class SourceState(db.Model):
+    """
+    Freshness bookkeeping per ranking source
+    Lets the scheduler tell whether a source has published new rankings.
+    """
+    __tablename__ = "source_states"
+
+    tour = db.Column(db.String(10), primary_key=True)
+    # Fingerprint of the top of the last ingested rankings
+    fingerprint = db.Column(db.String(64), nullable=True)
+    # HTTP validators from the last probe (conditional requests)
+    probe_etag = db.Column(db.String(200), nullable=True)
+    probe_last_modified = db.Column(db.String(100), nullable=True)
+    last_probe_at = db.Column(db.DateTime, nullable=True)
+    # Last time the rankings actually changed in our database
+    last_ingest_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "tour": self.tour,
+            "fingerprint": self.fingerprint,
+            "last_probe_at": self.last_probe_at.isoformat() if self.last_probe_at else None,
+            "last_ingest_at": self.last_ingest_at.isoformat() if self.last_ingest_at else None
+        }
+
+
+class DataVersion(db.Model):
+    """
+    Version stamp of a dataset cached in process memory
+    Bumped by the process that changes the data; every other process
+    polls this table and drops its caches when a stamp moves.
+    """
+    __tablename__ = "data_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+
+class RefreshToken(db.Model):
+    """
+    Long-lived refresh token (only its SHA-256 is stored)
+    Each use rotates it: the old row is marked used and a new one issued in
+    the same family. A used token coming back means it leaked, and the
+    whole family is revoked.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    family_id = db.Column(db.String(32), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    used_at = db.Column(db.DateTime, nullable=True)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+
+
+class RevokedToken(db.Model):
+    """
+    Access token revoked before its expiry (e.g. logout)
+    Rows are only needed until the token would have expired anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False)
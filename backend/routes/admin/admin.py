@@ -1,10 +1,21 @@
 # Route used to check Railway logs of scheduler
 import os
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, Response, request, jsonify, g, stream_with_context
 from datetime import datetime
 
 from ..api.authentification.middleware import jwt_required, admin_required
-from tasks.scheduler import trigger_manual_update
+from ..api.authentification.utils import token_cache_stats
+from tasks.jobs import enqueue_manual_update, get_job
+from ..api.rankings.cache import cache_stats as rankings_cache_stats
+from utils.cache import get_cache
+from utils.rate_limit import rate_limit
+from utils.log_reader import tail_lines, log_index
+from utils.log_follow import follow, format_cursor
+from utils.log_search import search_logs, LEVELS, TIMESTAMP_FORMAT
+from utils.logging_config import log_queue_stats
+from utils.log_archive import list_archives
+from config import Config
 
 
 admin_bp = Blueprint('admin', __name__)
@@ -20,16 +31,16 @@ def read_log_file_json(file_path, lines_to_show=50):
                 'exists': False
             }
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        total_lines = len(lines)
-        recent_lines = lines[-lines_to_show:] if total_lines > lines_to_show else lines
+        # Only the end of the file is read; the total comes from a running count
+        recent_lines = tail_lines(file_path, lines_to_show)
+        index_entry = log_index.entry(file_path)
+        total_lines = index_entry['lines']
         
         # Get file metadata
-        file_stats = os.stat(file_path)
-        file_size = file_stats.st_size
-        last_modified = datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+        file_size = index_entry['size']
+        last_modified = datetime.fromtimestamp(index_entry['mtime']).isoformat()
+        # Where /logs/<type>/follow should pick up from
+        cursor = format_cursor(index_entry['inode'], index_entry['offset'])
         
         return {
             'success': True,
@@ -42,7 +53,8 @@ def read_log_file_json(file_path, lines_to_show=50):
                 'file_size_bytes': file_size,
                 'file_size_kb': round(file_size / 1024, 1),
                 'last_modified': last_modified,
-                'lines_requested': lines_to_show
+                'lines_requested': lines_to_show,
+                'cursor': cursor
             }
         }
     
@@ -85,22 +97,21 @@ def get_logs_overview():
         filepath = info['path']
         
         if os.path.exists(filepath):
-            file_stats = os.stat(filepath)
-            with open(filepath, 'r') as f:
-                line_count = sum(1 for _ in f)
+            # Persisted index: only bytes appended since the last check are read
+            index_entry = log_index.entry(filepath)
             
             overview[log_type] = {
                 'filename': info['filename'],
                 'description': info['description'],
                 'exists': True,
-                'lines': line_count,
-                'size_bytes': file_stats.st_size,
-                'size_kb': round(file_stats.st_size / 1024, 1),
-                'last_modified': datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+                'lines': index_entry['lines'],
+                'size_bytes': index_entry['size'],
+                'size_kb': round(index_entry['size'] / 1024, 1),
+                'last_modified': datetime.fromtimestamp(index_entry['mtime']).isoformat()
             }
             
             total_files += 1
-            total_size += file_stats.st_size
+            total_size += index_entry['size']
         else:
             overview[log_type] = {
                 'filename': info['filename'],
@@ -120,6 +131,79 @@ def get_logs_overview():
             'total_size_bytes': total_size,
             'total_size_kb': round(total_size / 1024, 1),
             'timestamp': datetime.now().isoformat()
+        },
+        'queue': log_queue_stats()
+    })
+
+# Search: GET /admin/logs/search?q=&level=&since=&until=&log=&limit=
+@admin_bp.route('/logs/search', methods=['GET'])
+@jwt_required
+@admin_required
+def search_log_files():
+    """
+    Search log records, including the rotated backup (.1) and the archives
+    level is a minimum (WARNING also returns ERROR), since/until are ISO
+    datetimes, log limits the search to one of app/errors/scraping.
+    Returns the newest `limit` matching records, newest first.
+    """
+    log_paths = {
+        'app': 'logs/app.log',
+        'errors': 'logs/errors.log',
+        'scraping': 'logs/scraping.log'
+    }
+
+    log_type = request.args.get('log')
+    if log_type:
+        if log_type not in log_paths:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid log type. Must be one of: {', '.join(log_paths)}"
+            }), 400
+        log_paths = {log_type: log_paths[log_type]}
+
+    level = request.args.get('level', '').upper() or None
+    if level and level not in LEVELS:
+        return jsonify({'success': False, 'error': f"Invalid level. Must be one of: {', '.join(LEVELS)}"}), 400
+
+    try:
+        since = request.args.get('since')
+        until = request.args.get('until')
+        since = datetime.fromisoformat(since).strftime(TIMESTAMP_FORMAT) if since else None
+        until = datetime.fromisoformat(until).strftime(TIMESTAMP_FORMAT) if until else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'since/until must be ISO datetimes'}), 400
+
+    limit = min(request.args.get('limit', 200, type=int), 1000)  # Cap at 1000 records
+
+    result = search_logs(log_paths, request.args.get('q'), level, since, until, limit)
+    return jsonify({'success': True, **result})
+
+@admin_bp.route('/logs/archives', methods=['GET'])
+@jwt_required
+@admin_required
+def get_log_archives():
+    """Compressed log archives with the time range and size of each"""
+    archives = []
+    for archive_path, index in list_archives(Config.LOG_ARCHIVE_DIR):
+        archives.append({
+            'filename': os.path.basename(archive_path),
+            'log': index['log'],
+            'first': index['first'],
+            'last': index['last'],
+            'blocks': len(index['blocks']),
+            'size_bytes': index['size'],
+            'raw_size_bytes': index['raw_size'],
+            'ratio': round(index['raw_size'] / index['size'], 1) if index['size'] else None
+        })
+
+    return jsonify({
+        'success': True,
+        'archives': archives,
+        'summary': {
+            'total_archives': len(archives),
+            'total_size_bytes': sum(archive['size_bytes'] for archive in archives),
+            'max_size_bytes': Config.LOG_ARCHIVE_MAX_MB * 1024 * 1024,
+            'max_age_days': Config.LOG_ARCHIVE_MAX_DAYS
         }
     })
 
@@ -195,32 +279,120 @@ def tail_logs(log_type):
     
     return jsonify(log_data)
 
+# Live follow: Server-Sent Events from a byte-offset cursor
+# GET /admin/logs/<type>/follow?cursor=<inode>:<offset>
+@admin_bp.route('/logs/<log_type>/follow', methods=['GET'])
+@jwt_required
+@admin_required
+def follow_logs(log_type):
+    """
+    Stream lines appended to a log file as SSE events
+    Each event carries {"lines": [...]} with the cursor after them as its id.
+    Start from the cursor returned by /tail (no cursor = from now on); on
+    reconnect, the Last-Event-ID header resumes where the stream stopped.
+    Needs the Authorization header like every admin route, so the admin
+    panel reads it with fetch (AuthContext.followLogs), not EventSource.
+    """
+    valid_log_types = ['app', 'errors', 'scraping']
+    if log_type not in valid_log_types:
+        return jsonify({
+            'success': False,
+            'error': f"Invalid log type. Must be one of: {', '.join(valid_log_types)}"
+        }), 400
+
+    file_path = f'logs/{log_type}.log'
+    if not os.path.exists(file_path):
+        return jsonify({'success': False, 'error': f"Log file not found: {file_path}"}), 404
+
+    cursor = request.headers.get('Last-Event-ID') or request.args.get('cursor')
+
+    def events():
+        # Tell EventSource clients how long to wait before reconnecting
+        yield 'retry: 2000\n\n'
+        for lines, position in follow(file_path, cursor,
+                                      poll_seconds=Config.LOG_FOLLOW_POLL_SECONDS,
+                                      max_seconds=Config.LOG_FOLLOW_MAX_SECONDS):
+            if lines:
+                yield f"id: {position}\ndata: {json.dumps({'lines': lines})}\n\n"
+            else:
+                # Heartbeat comment: keeps proxies from closing an idle stream
+                yield f": {position}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @admin_bp.route('/scheduler-status')
 @jwt_required
 @admin_required
 def scheduler_status():
     """Check if scheduler is running"""
     try:
-        from tasks.scheduler import get_scheduled_jobs
+        from tasks.scheduler import get_scheduled_jobs, get_scheduler_status
         jobs = get_scheduled_jobs()
+        leadership = get_scheduler_status()
+
+        if jobs:
+            status = 'scheduler_running'
+        elif not leadership['is_leader']:
+            # Another process holds the lock and runs the jobs
+            status = 'standby'
+        else:
+            status = 'no_jobs_found'
+
         return {
             'jobs': [str(job) for job in jobs],
             'job_count': len(jobs),
-            'status': 'scheduler_running' if jobs else 'no_jobs_found'
+            'status': status,
+            'leadership': leadership
         }
     except Exception as e:
         return {'error': str(e)}
     
-@admin_bp.route('/trigger-manual-update')
+@admin_bp.route('/trigger-manual-update', methods=['GET', 'POST'])
 @jwt_required
 @admin_required
+@rate_limit('manual_update')
 def players_manual_update():
-    """Trigger Manual Update of ATP Players Table"""
+    """
+    Queue a manual update of the rankings tables
+    Returns immediately with a job id; poll /admin/jobs/<job_id> for progress.
+    A trigger while an update is active returns the running job instead.
+    """
     try:
-        trigger_manual_update()
-        # All Flask routes need to return
-        return {'success': True, 'message': 'Manual update completed successfully'}
+        job, created = enqueue_manual_update(requested_by=g.current_user_id)
+        return jsonify({
+            'success': True,
+            'message': 'Manual update queued' if created else 'Manual update already in progress',
+            'coalesced': not created,
+            'job_id': job['id'],
+            'job': job
+        }), 202
 
     except Exception as e:
         print("Manual Update Failed")
-        return {'success': False, 'error': str(e)}
+        return jsonify({'success': False, 'error': str(e)}), 503
+
+@admin_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required
+@admin_required
+def get_job_status(job_id):
+    """State, stage and timing of a manual update job"""
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@admin_bp.route('/cache-stats', methods=['GET'])
+@jwt_required
+@admin_required
+def get_cache_stats():
+    """Shared cache, rankings cache and verified-token cache counters"""
+    return jsonify({
+        'success': True,
+        'cache': get_cache().stats(),
+        'rankings': rankings_cache_stats(),
+        'tokens': token_cache_stats()
+    })
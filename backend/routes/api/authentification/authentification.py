@@ -3,21 +3,27 @@ import re
 
 from flask import (
     Blueprint,
+    Response,
     request,
     jsonify
 )
 from models import User, db
+from sqlalchemy.exc import IntegrityError
 from .utils import (
     hash_password,
-    generate_jwt_token,
-    verify_password
+    verify_password,
+    needs_rehash,
+    verify_jwt_token,
+    HashingBusy
 )
 from .middleware import jwt_required
+from .user_cache import get_cached_me, cache_me
+from .refresh_tokens import issue_session, rotate_refresh_token, revoke_refresh_token
+from .revocation import revoke_token
+from utils.rate_limit import rate_limit
 from flask import g
 
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport import requests as google_requests
-import requests
+from .google_oauth import build_flow, fetch_google_user
 
  
 
@@ -28,6 +34,7 @@ import time
 # /api/auth:
 # /signup
 # /login
+# /refresh
 # /logout
 # /me
 # /google/login
@@ -40,6 +47,7 @@ auth_bp = Blueprint('auth', __name__)
 
 ############################ MAIN ROUTES ############################
 @auth_bp.route("/signup", methods=["POST"])
+@rate_limit('signup')
 def signup():
 
     print(f"🚨 SIGNUP ROUTE CALLED: {request.method}")
@@ -88,44 +96,47 @@ def signup():
         }), 400
 
     # VALIDATION PASSED
-    # 1. Check if email already exists
     try:
-        existing_user = User.query.filter_by(email=email).first()
-    except Exception:
-        return jsonify({"error": "Database error"}), 500
-
-    if existing_user:
-        return jsonify ({
-            "error": "Email is already in use"
-        }), 400
-    try:
-        # 2. Hash password
+        # 1. Hash password
         hashed_password = hash_password(password)
 
-        # 3. Save new User to DB
+        # 2. Save new User to DB
+        # No existence check first: the unique email index rejects duplicates
         new_user = User(
             email=email,
             name=name,
             password_hash=hashed_password
         )
         db.session.add(new_user)
-        db.session.commit()
+        db.session.flush()
 
-        # 4. Generate JWT w/ user Id // .id automatically available after commit
-        token = generate_jwt_token(new_user.id)
+        # 3. Generate JWT w/ user Id // .id available after flush
+        # Built before commit, which would expire the object and cost a reload
+        token, refresh_token = issue_session(new_user)
+        user_data = new_user.to_dict()
+        db.session.commit()
 
-        # 5. Return JWT with user info
+        # 4. Return JWT with user info
         return jsonify ({
             "message": "User created successfully",
             "token": token,
-            "user": new_user.to_dict()
+            "refresh_token": refresh_token,
+            "user": user_data
         }), 201
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify ({
+            "error": "Email is already in use"
+        }), 400
+    except HashingBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": "Failed to create user"}), 500
 
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit('login')
 def login():
     # Add a timer for testing.
     # time.sleep(3)
@@ -156,19 +167,80 @@ def login():
     # 2. Verify password and generate JWT
     try:
         if verify_password(password, existing_user.password_hash):
-            token = generate_jwt_token(existing_user.id)
+            # Upgrade hashes made with an older cost while we have the password
+            if needs_rehash(existing_user.password_hash):
+                rehash_password(existing_user, password)
+
+            token, refresh_token = issue_session(existing_user)
+            user_data = existing_user.to_dict()
+            db.session.commit()
+
             return jsonify ({
                 "message": "User logged in successfully",
                 "token": token,
-                "user": existing_user.to_dict()
+                "refresh_token": refresh_token,
+                "user": user_data
             }), 200
         else:
             return jsonify({"message": "Invalid credentials"}), 401
+    except HashingBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": "Invalid credentials"}), 401
 
+def rehash_password(user, password):
+    """Hash with the current cost (saved with the login); login still succeeds if this fails"""
+    try:
+        user.password_hash = hash_password(password)
+    except Exception:
+        pass
+
+@auth_bp.route("/refresh", methods=["POST"])
+@rate_limit('refresh')
+def refresh():
+    """Trade a refresh token for a new access token (and a new refresh token)"""
+    data = request.get_json(silent=True) or {}
+    raw_token = data.get('refresh_token')
+
+    if not raw_token:
+        return jsonify({"error": "Refresh token is required"}), 400
+
+    try:
+        user_data, token, refresh_token = rotate_refresh_token(raw_token)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 401
+    except Exception:
+        db.session.rollback()
+        return jsonify({"error": "Database error"}), 500
+
+    return jsonify({
+        "message": "Token refreshed",
+        "token": token,
+        "refresh_token": refresh_token,
+        "user": user_data
+    }), 200
+
 @auth_bp.route("/logout", methods=["POST"])
 def logout():
+    # Ends the refresh token's session so it can't mint new access tokens
+    data = request.get_json(silent=True) or {}
+    if data.get('refresh_token'):
+        try:
+            revoke_refresh_token(data['refresh_token'])
+        except Exception:
+            db.session.rollback()
+
+    # Kills the access token too, instead of letting it live until it expires
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        try:
+            revoke_token(verify_jwt_token(auth_header.split(' ')[1]))
+        except ValueError:
+            pass  # Already invalid, expired or revoked
+        except Exception:
+            db.session.rollback()
+
     return jsonify({
         "message": "User logged out"
     }), 200
@@ -178,15 +250,26 @@ def logout():
 def get_current_user():
     user_id = g.current_user_id # Available from middleware
 
-    # Query db
-    user = User.query.get(user_id)
+    # Served from cache when possible (see user_cache.py)
+    entry = get_cached_me(user_id)
+    if entry is None:
+        # Query db
+        user = db.session.get(User, user_id)
 
-    if not user:
-        return jsonify({"error": "User not present in db"}), 404
-    
-    return jsonify({
-        "user": user.to_dict()
-    }), 200
+        if not user:
+            return jsonify({"error": "User not present in db"}), 404
+
+        entry = cache_me(user_id, user.to_dict())
+
+    # Unchanged since the client's copy: no body needed
+    if request.if_none_match.contains(entry['etag']):
+        response = Response(status=304)
+    else:
+        response = Response(entry['body'], status=200, mimetype='application/json')
+
+    response.set_etag(entry['etag'])
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 ############################ GOOGLE AUTH ROUTES ############################
@@ -201,50 +284,15 @@ def google_callback():
     
     authorization_code = data.get('code')
 
-    # code from Front exchanged for token
-    # Formulate Request.
-    # Make a token request to google with formulated Request.
-    # Uses flow object. Same as google login
+    # code from Front exchanged for tokens over a pooled connection.
+    # The ID token is verified locally against Google's cached signing
+    # certificates, so no userinfo request is needed (see google_oauth.py)
     try:
-        flow = Flow.from_client_config(
-            {
-                "web": {
-                    "client_id": os.environ.get("GOOGLE_CLIENT_ID"),
-                    "client_secret": os.environ.get("GOOGLE_CLIENT_SECRET"),
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token",
-                    "redirect_uris": ["http://localhost:3000/auth/callback"]
-                }
-            },
-            scopes=[
-                "openid", 
-                "https://www.googleapis.com/auth/userinfo.email",
-                "https://www.googleapis.com/auth/userinfo.profile"
-            ]
-        )
-        flow.redirect_uri = "http://localhost:3000/auth/callback"
-
-        # Exchange authorization code for access token
-        # This makes a POST request to Google and the result is stored on
-        # flow.credentials.[field] afterwards.
-        # All happens over the same HTTP connection. Synchronous.
-        flow.fetch_token(code=authorization_code)
-
-        # Now get user info, using the token we got from the code/token exchange
-        # Use access token to get user info
-        user_info_response = requests.get(
-            'https://www.googleapis.com/oauth2/v2/userinfo',
-            headers={"Authorization": f"Bearer {flow.credentials.token}"}
-        )
-
-        if user_info_response.status_code != 200:
-            return jsonify({"error" : "Failed to get user info from Google"}), 400
-        
-        google_user_data = user_info_response.json()
+        google_user_data = fetch_google_user(authorization_code)
 
         # LOGGIN/SIGNIN IN USER.
         # It's one single callback for both.
-        google_id = google_user_data['id']
+        google_id = google_user_data['google_id']
         email = google_user_data['email']
         name = google_user_data['name']
 
@@ -272,44 +320,31 @@ def google_callback():
                     auth_method="google"
                 )
                 db.session.add(user)
-                db.session.commit()
+                db.session.flush()
 
         # Create JWT. Both cases. Login and SignUp
-        token = generate_jwt_token(user.id)
+        # Built before commit, which would expire the new user and cost a reload
+        token, refresh_token = issue_session(user)
+        user_data = user.to_dict()
+        db.session.commit()
 
         # time.sleep(3)
 
         return jsonify ({
             "message": "Google login successful",
             "token": token,
-            "user": user.to_dict()
+            "refresh_token": refresh_token,
+            "user": user_data
         }), 200
 
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": f"Token exchange failed: {str(e)}"}), 400
 
 @auth_bp.route("/google/login", methods=["GET"])
 def google_login():
-    flow = Flow.from_client_config(
-        {
-            "web": {
-                "client_id": os.environ.get("GOOGLE_CLIENT_ID"),
-                "client_secret": os.environ.get("GOOGLE_CLIENT_SECRET"),
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": ["http://localhost:3000/auth/callback"]
-                # Google will redirect to the frontend -> 3000
-            }
-        },
-        scopes=[
-            "openid", 
-            "https://www.googleapis.com/auth/userinfo.email",
-            "https://www.googleapis.com/auth/userinfo.profile"
-        ]
-    )
-
-    # Set redirect URI
-    flow.redirect_uri = "http://localhost:3000/auth/callback"
+    # Client config and scopes are built once (google_oauth.py)
+    flow = build_flow()
 
     # Generate authorization URL
     authorization_url, state = flow.authorization_url(
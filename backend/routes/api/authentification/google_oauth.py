@@ -0,0 +1,171 @@
+"""
+Google sign-in helpers
+- The client config and scopes are built once, not on every request
+- Calls to Google go through one pooled keep-alive session
+- The ID token from the code exchange is verified locally against Google's
+  signing certificates (cached until their max-age), so the userinfo
+  request is no longer needed
+Endpoints come from Config, so a local stand-in can replace Google
+(scripts/oauth_standin.py).
+"""
+
+import re
+import time
+import logging
+import threading
+from functools import lru_cache
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+from google.auth import jwt as google_jwt
+from google_auth_oauthlib.flow import Flow
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCOPES = [
+    "openid",
+    "https://www.googleapis.com/auth/userinfo.email",
+    "https://www.googleapis.com/auth/userinfo.profile"
+]
+ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# An unknown key id triggers a refetch, but not more often than this
+CERTS_MIN_REFRESH_SECONDS = 60
+
+
+@lru_cache(maxsize=1)
+def client_config():
+    return {
+        "web": {
+            "client_id": Config.GOOGLE_CLIENT_ID,
+            "client_secret": Config.GOOGLE_CLIENT_SECRET,
+            "auth_uri": Config.GOOGLE_AUTH_URI,
+            "token_uri": Config.GOOGLE_TOKEN_URI,
+            "redirect_uris": [Config.GOOGLE_REDIRECT_URI]
+            # Google will redirect to the frontend -> 3000
+        }
+    }
+
+
+def build_flow():
+    """Flow for building the consent URL (holds per-request state, so not shared)"""
+    flow = Flow.from_client_config(client_config(), scopes=SCOPES)
+    flow.redirect_uri = Config.GOOGLE_REDIRECT_URI
+    return flow
+
+
+@lru_cache(maxsize=1)
+def http_session():
+    """Keep-alive session shared by all requests to Google"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=Config.GOOGLE_HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+############################ SIGNING CERTIFICATES ############################
+class CertCache:
+    """Google's token signing certificates {kid: PEM}, refreshed on expiry"""
+    def __init__(self, url, default_ttl):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.certs = {}
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self.fetches = 0
+
+    def _fetch(self):
+        response = http_session().get(self.url, timeout=10)
+        response.raise_for_status()
+
+        ttl = self.default_ttl
+        max_age = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+        if max_age:
+            ttl = int(max_age.group(1))
+
+        self.certs = response.json()
+        self.fetched_at = time.monotonic()
+        self.expires_at = self.fetched_at + ttl
+        self.fetches += 1
+
+    def get(self, kid):
+        """Certificates containing `kid` (refetched if expired or rotated)"""
+        with self.lock:
+            now = time.monotonic()
+            expired = now >= self.expires_at
+            rotated = kid not in self.certs and now - self.fetched_at >= CERTS_MIN_REFRESH_SECONDS
+            if expired or rotated:
+                self._fetch()
+            return self.certs
+
+
+_certs = CertCache(Config.GOOGLE_CERTS_URI, Config.GOOGLE_CERTS_TTL_SECONDS)
+
+
+def verify_id_token(id_token):
+    """Check signature, audience, issuer and expiry; returns the claims"""
+    kid = jwt.get_unverified_header(id_token).get('kid')
+    certs = _certs.get(kid)
+    if kid not in certs:
+        raise ValueError("ID token signed with an unknown key")
+
+    claims = google_jwt.decode(
+        id_token,
+        certs={kid: certs[kid]},
+        audience=Config.GOOGLE_CLIENT_ID,
+        clock_skew_in_seconds=10
+    )
+    if claims.get('iss') not in ISSUERS:
+        raise ValueError("ID token has the wrong issuer")
+    return claims
+
+
+############################ CODE EXCHANGE ############################
+def exchange_code(authorization_code):
+    """Swap the code from the frontend for tokens (one POST to Google)"""
+    response = http_session().post(
+        Config.GOOGLE_TOKEN_URI,
+        data={
+            'code': authorization_code,
+            'client_id': Config.GOOGLE_CLIENT_ID,
+            'client_secret': Config.GOOGLE_CLIENT_SECRET,
+            'redirect_uri': Config.GOOGLE_REDIRECT_URI,
+            'grant_type': 'authorization_code'
+        },
+        timeout=10
+    )
+    if response.status_code != 200:
+        raise ValueError(f"Google token endpoint returned {response.status_code}")
+    return response.json()
+
+
+def fetch_google_user(authorization_code):
+    """
+    Identity of the Google account behind an authorization code
+    Returns {'google_id', 'email', 'name'}
+    """
+    tokens = exchange_code(authorization_code)
+
+    if tokens.get('id_token'):
+        claims = verify_id_token(tokens['id_token'])
+        return {
+            'google_id': claims['sub'],
+            'email': claims['email'],
+            'name': claims.get('name') or claims['email']
+        }
+
+    # No ID token (shouldn't happen with the openid scope): ask userinfo
+    response = http_session().get(
+        Config.GOOGLE_USERINFO_URI,
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        timeout=10
+    )
+    if response.status_code != 200:
+        raise ValueError("Failed to get user info from Google")
+    data = response.json()
+    return {'google_id': data['id'], 'email': data['email'], 'name': data['name']}
@@ -0,0 +1,100 @@
+"""
+Rotating refresh tokens
+Access tokens are short-lived. Instead of logging in again (a bcrypt
+check), the client trades its refresh token for a new access token and a
+new refresh token: one indexed lookup by token hash. The new access token
+is built from the current users row, so is_admin changes apply on refresh.
+"""
+
+import uuid
+import secrets
+import hashlib
+from datetime import timedelta
+
+from config import Config
+from models import RefreshToken, User, db
+from tasks.leader_lock import utcnow
+from .utils import issue_token
+
+
+def hash_refresh_token(raw_token):
+    return hashlib.sha256(raw_token.encode('utf-8')).hexdigest()
+
+
+def issue_refresh_token(user_id, family_id=None):
+    """Create a refresh token (caller commits); returns the raw token"""
+    raw_token = secrets.token_urlsafe(32)
+    now = utcnow()
+    db.session.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(raw_token),
+        family_id=family_id or uuid.uuid4().hex,
+        created_at=now,
+        expires_at=now + timedelta(days=Config.REFRESH_TOKEN_DAYS)
+    ))
+    return raw_token
+
+
+def issue_session(user):
+    """Access token + new refresh token for a user that just authenticated"""
+    access_token = issue_token(user)
+    refresh_token = issue_refresh_token(user.id)
+    return access_token, refresh_token
+
+
+def rotate_refresh_token(raw_token):
+    """
+    Spend a refresh token
+    Returns (user_dict, access_token, new_refresh_token); raises ValueError if
+    the token is unknown, expired, revoked or already used.
+    """
+    now = utcnow()
+    token = RefreshToken.query.filter_by(token_hash=hash_refresh_token(raw_token)).first()
+    if token is None:
+        raise ValueError("Invalid refresh token")
+
+    if token.revoked_at is not None:
+        raise ValueError("Refresh token has been revoked")
+    if token.expires_at <= now:
+        raise ValueError("Refresh token has expired")
+
+    # Mark used in one conditional statement, so two concurrent refreshes
+    # with the same token can't both succeed
+    claimed = (
+        RefreshToken.query
+        .filter(RefreshToken.id == token.id, RefreshToken.used_at.is_(None))
+        .update({'used_at': now}, synchronize_session=False)
+    )
+    if not claimed:
+        # Replayed token: someone else holds a copy - end the whole session
+        revoke_family(token.family_id)
+        db.session.commit()
+        raise ValueError("Refresh token was already used")
+
+    user = db.session.get(User, token.user_id)
+    if user is None:
+        db.session.rollback()
+        raise ValueError("User not found")
+
+    access_token = issue_token(user)
+    new_refresh_token = issue_refresh_token(user.id, token.family_id)
+    user_data = user.to_dict()
+    db.session.commit()
+    return user_data, access_token, new_refresh_token
+
+
+def revoke_family(family_id):
+    """Revoke every token of one login session (caller commits)"""
+    RefreshToken.query.filter(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at.is_(None)
+    ).update({'revoked_at': utcnow()}, synchronize_session=False)
+
+
+def revoke_refresh_token(raw_token):
+    """Logout: end the session the token belongs to"""
+    token = RefreshToken.query.filter_by(token_hash=hash_refresh_token(raw_token)).first()
+    if token is not None:
+        revoke_family(token.family_id)
+        db.session.commit()
+
@@ -0,0 +1,117 @@
+"""
+Access token revocation
+Revoked token ids (jti) are stored in revoked_tokens and mirrored in
+memory, so jwt_required never queries the database. Lookups go through a
+Bloom filter first: for the overwhelming majority of tokens (never
+revoked) it answers "no" from a few bit checks, and only possible hits
+consult the exact set.
+
+Other processes reload the list when the 'revocations' data version
+moves. Each reload only keeps tokens that haven't expired; the daily
+prune job reloads and bumps the version too, so expired entries leave
+memory even when nothing new is revoked.
+"""
+
+import math
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+from config import Config
+from models import RevokedToken, db
+from tasks.data_version import bump_version, on_version_change
+from tasks.leader_lock import utcnow
+
+REVOCATIONS_VERSION = 'revocations'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` items at `error_rate`"""
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.bloom = BloomFilter(capacity)
+        self.revoked = {}   # jti -> expires_at (naive UTC)
+
+    def add(self, jti, expires_at):
+        with self.lock:
+            self.bloom.add(jti)
+            self.revoked[jti] = expires_at
+
+    def replace(self, entries):
+        """Swap in a freshly loaded {jti: expires_at}"""
+        bloom = BloomFilter(max(self.capacity, len(entries)))
+        for jti in entries:
+            bloom.add(jti)
+        with self.lock:
+            self.bloom, self.revoked = bloom, entries
+
+    def __contains__(self, jti):
+        return jti in self.bloom and jti in self.revoked
+
+
+_revocations = RevocationList(Config.REVOCATION_CAPACITY)
+
+
+def is_revoked(jti):
+    return jti in _revocations
+
+
+def revoke_token(claims):
+    """Revoke a verified access token everywhere (commits)"""
+    jti = claims.get('jti')
+    if not jti:
+        return False
+
+    expires_at = datetime.fromtimestamp(claims['exp'], timezone.utc).replace(tzinfo=None)
+    if db.session.get(RevokedToken, jti) is None:
+        db.session.add(RevokedToken(
+            jti=jti,
+            user_id=claims.get('user_id'),
+            expires_at=expires_at,
+            revoked_at=utcnow()
+        ))
+        db.session.commit()
+
+    _revocations.add(jti, expires_at)
+    bump_version(REVOCATIONS_VERSION, time.time_ns())
+    return True
+
+
+def refresh_revocations():
+    """Reload this process's list and have every other process reload theirs"""
+    load_revocations()
+    bump_version(REVOCATIONS_VERSION, time.time_ns())
+
+
+@on_version_change(REVOCATIONS_VERSION)
+def load_revocations(version=None):
+    """Reload the live (unexpired) revocations from the database"""
+    rows = (
+        db.session.query(RevokedToken.jti, RevokedToken.expires_at)
+        .filter(RevokedToken.expires_at > utcnow())
+        .all()
+    )
+    _revocations.replace({jti: expires_at for jti, expires_at in rows})
@@ -0,0 +1,61 @@
+"""
+Cached /api/auth/me responses
+The SPA calls /me on every page load. The serialised response is kept in
+the shared cache per user, with an ETag, so session bootstrap is a cache
+lookup (or a 304) instead of a users query.
+
+Entries are keyed by a generation that changes whenever any user's
+profile changes (admin flag, Google link, profile edit). The generation is
+a data version, so every process drops stale entries within seconds.
+"""
+
+import time
+import hashlib
+
+from flask import current_app
+
+from tasks.data_version import bump_version, on_version_change
+from utils.cache import get_cache
+
+USERS_VERSION = 'users'
+
+# Current generation of cached profiles (a data version)
+_generation = 0
+
+
+def me_key(user_id):
+    return f"users:me:{_generation}:{user_id}"
+
+
+def get_cached_me(user_id):
+    """Cached {'body', 'etag'} for the user, or None"""
+    return get_cache().get(me_key(user_id))
+
+
+def cache_me(user_id, user_data):
+    """Serialise the /me body once and cache it with its ETag"""
+    body = current_app.json.dumps({"user": user_data})
+    entry = {
+        'body': body,
+        'etag': hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+    }
+    get_cache().set(me_key(user_id), entry)
+    return entry
+
+
+def invalidate_user(user_id):
+    """
+    Call after committing a change to a user's profile
+    Switches this process immediately and other processes on their next poll.
+    """
+    global _generation
+
+    get_cache().delete(me_key(user_id))
+    _generation = time.time_ns()
+    bump_version(USERS_VERSION, _generation)
+
+
+@on_version_change(USERS_VERSION)
+def switch_generation(version):
+    global _generation
+    _generation = version
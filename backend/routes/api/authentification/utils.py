@@ -1,36 +1,89 @@
+import os
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 import jwt
 from flask import current_app
-from models import User
 from datetime import datetime, timezone, timedelta
 from config import Config
+from utils.cache import MemoryCache
+from .revocation import is_revoked
+
+logger = logging.getLogger(__name__)
+
+
+############################ PASSWORD HASHING ############################
+# bcrypt is deliberately slow, so it runs on a small pool sized to the CPU
+# count instead of on every request thread at once. When the pool is
+# backed up, new logins are rejected straight away (HashingBusy -> 503)
+# rather than queueing up and stalling the other endpoints.
+
+class HashingBusy(RuntimeError):
+    pass
+
+
+_hash_executor = ThreadPoolExecutor(
+    max_workers=Config.BCRYPT_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix='bcrypt'
+)
+_pending_lock = threading.Lock()
+_pending = 0
+
+
+def _run_hashing(func, *args):
+    """Run a bcrypt call on the pool, refusing work past BCRYPT_MAX_PENDING"""
+    global _pending
+
+    with _pending_lock:
+        if _pending >= Config.BCRYPT_MAX_PENDING:
+            logger.warning(f"Password hashing queue full ({_pending} pending) - rejecting")
+            raise HashingBusy("Too many logins in progress, try again shortly")
+        _pending += 1
+
+    try:
+        return _hash_executor.submit(func, *args).result()
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
 
 def hash_password(password):
     """Hash a password for storing the db"""
-    # Generate salt and hash password
-    salt = bcrypt.gensalt()
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
+    # Generate salt (configured cost) and hash password
+    salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+    password_hash = _run_hashing(bcrypt.hashpw, password.encode('utf-8'), salt)
     return password_hash.decode('utf-8')
 
 def verify_password(password, password_hash):
     """Verify a password against its hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    return _run_hashing(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+def needs_rehash(password_hash):
+    """True when a stored hash was made with a different cost than configured"""
+    # Format: $2b$<cost>$<salt+hash>
+    try:
+        return int(password_hash.split('$')[2]) != Config.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
 
-def generate_jwt_token(user_id):
+def issue_token(user):
     """
     Generate JWT token with user_id and admin status
+    Takes the User the route already loaded, so no extra query
     """
     try:
-        # Get user from database to include admin status
-        user = User.query.get(user_id)
-        if not user:
-            raise ValueError("User not found")
-        
         payload = {
-            'user_id': user_id,
+            'user_id': user.id,
             'is_admin': user.is_admin,  # Include admin status from database
-            'exp': datetime.now(timezone.utc) + timedelta(hours=24),  # Token expires in 24 hours
-            'iat': datetime.now(timezone.utc)  # Issued at
+            # Short-lived; clients renew it with their refresh token
+            'exp': datetime.now(timezone.utc) + timedelta(minutes=Config.ACCESS_TOKEN_MINUTES),
+            'iat': datetime.now(timezone.utc),  # Issued at
+            'jti': uuid.uuid4().hex  # Token id, used to revoke it
         }
         
         token = jwt.encode(
@@ -43,18 +96,23 @@ def generate_jwt_token(user_id):
     
     except Exception as e:
         raise ValueError(f"Token generation failed: {str(e)}")
-    """ payload = {
-        'user_id': user_id,
-        'exp': datetime.now(timezone.utc) + timedelta(hours=24),
-        'iat': datetime.now(timezone.utc)
-    }
 
-    return jwt.encode(payload, Config.JWT_SECRET, algorithm='HS256') """
+############################ TOKEN VERIFICATION ############################
+# The SPA sends the same token on every request. Verified claims are kept
+# in process memory, keyed by a digest of the token, until the token
+# expires - repeat requests skip the signature check entirely.
+_verified_tokens = MemoryCache(max_entries=Config.TOKEN_CACHE_SIZE)
+
 
 def verify_jwt_token(token):
     """
     Verify JWT token and return payload with user_id and admin status
     """
+    digest = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    claims = _verified_tokens.get(digest)
+    if claims is not None:
+        return check_not_revoked(claims)
+
     try:
         payload = jwt.decode(
             token, 
@@ -62,12 +120,21 @@ def verify_jwt_token(token):
             algorithms=['HS256']
         )
         
-        return {
+        claims = {
             'user_id': payload.get('user_id'),
             'is_admin': payload.get('is_admin', False),  # Default to False if not present
             'exp': payload.get('exp'),
-            'iat': payload.get('iat')
+            'iat': payload.get('iat'),
+            'jti': payload.get('jti')
         }
+
+        # Tokens without an expiry are verified every time
+        if claims['exp']:
+            ttl = claims['exp'] - time.time()
+            if ttl > 0:
+                _verified_tokens.set(digest, claims, ttl=ttl)
+
+        return check_not_revoked(claims)
     
     except jwt.ExpiredSignatureError:
         raise ValueError("Token has expired")
@@ -82,6 +149,12 @@ def verify_jwt_token(token):
     except jwt.InvalidTokenError:
         return None """
     
+def check_not_revoked(claims):
+    """In-memory check (Bloom filter + set), no database access"""
+    if claims['jti'] and is_revoked(claims['jti']):
+        raise ValueError("Token has been revoked")
+    return claims
+
 def decode_token_from_header(request):
     """
     Extract and decode token from Authorization header
@@ -99,3 +172,7 @@ def decode_token_from_header(request):
     payload = verify_jwt_token(token)
     
     return payload['user_id'], payload['is_admin']
+
+
+def token_cache_stats():
+    return _verified_tokens.stats()
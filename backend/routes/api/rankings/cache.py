@@ -0,0 +1,163 @@
+"""
+Rankings page cache
+Responses for /api/rankings/players are cached per data version in the
+shared cache (utils/cache.py), so with a Redis backend a page built by
+one node is served by all of them. The version is part of the key: a node
+that hasn't seen a new version yet reads and writes its own version's
+entries and never overwrites a newer page. Warming builds every standard
+page for a new version before it is published, so readers never hit a
+cold cache right after an update.
+"""
+
+import time
+import threading
+
+from config import Config
+from models import Player, db
+from tasks.sources import SOURCES
+from tasks.cache_warming import cache_warmer, version_listener
+from utils.cache import get_cache
+from utils.single_flight import SingleFlight
+
+# Page sizes pre-built on warm: the SPA's default and the API maximum
+WARM_PAGE_SIZES = (20, 50)
+
+_lock = threading.Lock()
+_staged = {}              # version -> pages warmed but not yet published
+_current_version = 0      # version readers are served from
+_previous_version = None  # version served as stale data right after a switch
+_superseded_at = 0.0      # monotonic time the previous version was replaced
+
+# Only one request per page rebuilds a missing entry; others share its result
+_flights = SingleFlight()
+_stats = {'hits': 0, 'misses': 0, 'stale_served': 0}
+_stats_lock = threading.Lock()
+
+
+def count(stat):
+    # Request threads update these concurrently
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def build_players_page(tour, offset, limit):
+    """Query one page of players and its pagination metadata"""
+    # Get total count for pagination metadata
+    total_count = Player.query.filter_by(tour=tour).count()
+
+    # Query players with pagination, ordered by ranking
+    # Profiles are loaded in the same query to avoid one lookup per player
+    players = (
+        Player.query
+        .filter_by(tour=tour)
+        .options(db.joinedload(Player.profile))
+        .order_by(Player.ranking)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+    # Convert to dictionaries
+    players_data = [player.to_dict() for player in players]
+
+    # Calculate pagination metadata
+    has_more = (offset + limit) < total_count
+    next_offset = offset + limit if has_more else None
+
+    return {
+        'tour': tour,
+        'players': players_data,
+        'pagination': {
+            'offset': offset,
+            'limit': limit,
+            'total_count': total_count,
+            'returned_count': len(players_data),
+            'has_more': has_more,
+            'next_offset': next_offset
+        }
+    }
+
+
+def page_key(version, tour, offset, limit):
+    return f"rankings:page:{version}:{tour}:{offset}:{limit}"
+
+
+def get_players_page(tour, offset, limit):
+    """
+    Cached page for the current version
+    On a miss one request rebuilds the page while concurrent requests for
+    the same page wait for it - or, within RANKINGS_STALE_SECONDS of a
+    version change, get the previous version's page straight away.
+    """
+    version = _current_version
+    key = page_key(version, tour, offset, limit)
+    cache = get_cache()
+
+    page = cache.get(key)
+    if page is not None:
+        count('hits')
+        return page
+
+    stale = None
+    previous = _previous_version
+    if previous is not None and time.monotonic() - _superseded_at <= Config.RANKINGS_STALE_SECONDS:
+        stale = cache.get(page_key(previous, tour, offset, limit))
+
+    def rebuild():
+        count('misses')
+        page = build_players_page(tour, offset, limit)
+        # Don't store under a version that was replaced while we queried
+        if version == _current_version:
+            cache.set(key, page)
+        return page
+
+    page, shared = _flights.do((version, key), rebuild, stale=stale)
+    if shared and page is stale:
+        count('stale_served')
+    return page
+
+
+@cache_warmer('rankings_pages')
+def warm_players_pages(version, tours):
+    """Pre-build every standard page of every tour for `version`"""
+    pages = {}
+    for tour in SOURCES:
+        total_count = Player.query.filter_by(tour=tour).count()
+        for limit in WARM_PAGE_SIZES:
+            for offset in range(0, max(total_count, 1), limit):
+                pages[page_key(version, tour, offset, limit)] = build_players_page(tour, offset, limit)
+
+    with _lock:
+        _staged[version] = pages
+
+
+@version_listener('rankings_pages')
+def publish_version(version):
+    """
+    Switch readers to `version`
+    Pages that weren't warmed are rebuilt on first request; until then the
+    previous version's page is served as stale data during the
+    stale-while-revalidate window.
+    """
+    global _current_version, _previous_version, _superseded_at
+
+    cache = get_cache()
+    with _lock:
+        for key, page in _staged.pop(version, {}).items():
+            cache.set(key, page)
+        _staged.clear()
+        if version != _current_version:
+            _previous_version = _current_version
+        _current_version = version
+        _superseded_at = time.monotonic()
+
+
+def cache_stats():
+    """Counters for the admin dashboard"""
+    with _stats_lock:
+        stats = dict(_stats)
+    return {
+        **stats,
+        'version': _current_version,
+        'single_flight': _flights.stats()
+    }
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from models import Player, db
+from tasks.sources import SOURCES, DEFAULT_TOUR
+from .cache import get_players_page
 from ..authentification.middleware import jwt_required
 import time
 
@@ -14,46 +15,29 @@ def get_players():
     Query params:
     - offset: starting position (default: 0)
     - limit: number of players to return (default: 20, max: 50)
+    - tour: atp or wta (default: atp)
     
-    Example: /api/rankings/players?offset=0&limit=20
+    Example: /api/rankings/players?offset=0&limit=20&tour=wta
     """
     # time.sleep(3)
     try:
         # Get query parameters
         offset = request.args.get('offset', 0, type=int)
         limit = request.args.get('limit', 20, type=int)
+        tour = request.args.get('tour', DEFAULT_TOUR).lower()
         
         # Validate parameters
+        if tour not in SOURCES:
+            return jsonify({'error': f"Tour must be one of: {', '.join(SOURCES)}"}), 400
+        
         if offset < 0:
             return jsonify({'error': 'Offset must be non-negative'}), 400
         
         if limit <= 0 or limit > 50:
             return jsonify({'error': 'Limit must be between 1 and 50'}), 400
         
-        # Get total count for pagination metadata
-        total_count = Player.query.count()
-        
-        # Query players with pagination, ordered by ranking
-        players = Player.query.order_by(Player.ranking).offset(offset).limit(limit).all()
-        
-        # Convert to dictionaries
-        players_data = [player.to_dict() for player in players]
-        
-        # Calculate pagination metadata
-        has_more = (offset + limit) < total_count
-        next_offset = offset + limit if has_more else None
-        
-        response = {
-            'players': players_data,
-            'pagination': {
-                'offset': offset,
-                'limit': limit,
-                'total_count': total_count,
-                'returned_count': len(players_data),
-                'has_more': has_more,
-                'next_offset': next_offset
-            }
-        }
+        # Served from the per-version page cache (warmed after each ingest)
+        response = get_players_page(tour, offset, limit)
         
         return jsonify(response), 200
         
@@ -0,0 +1,70 @@
+# RUN FROM PROJECT ROOT
+# python -m scripts.benchmark_log_tail [--mb 10] [--lines 200] [--runs 20]
+#
+# Compares the old admin log reader (readlines() on the whole file) with
+# the reverse-seek tail reader + running line count, on a generated log
+# file the size of a full app.log (10 MB by default).
+
+import os
+import sys
+import time
+import tempfile
+
+from utils.log_reader import tail_lines, LogIndex
+
+SAMPLE_LINE = (
+    "2026-10-19 21:14:03,512 - scraping - INFO - ingest.py:76 - "
+    "[atp] Top 3: #1 Jannik Sinner (11330) | #2 Carlos Alcaraz (8850) | #3 Alexander Zverev (7285)\n"
+)
+
+
+def arg(name, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def old_reader(path, lines_to_show):
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    total_lines = len(lines)
+    recent_lines = lines[-lines_to_show:] if total_lines > lines_to_show else lines
+    return recent_lines, total_lines
+
+
+def timed(func, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = func()
+    return (time.perf_counter() - start) / runs * 1000, result
+
+
+def main():
+    size_mb = arg('--mb', 10.0)
+    lines_to_show = arg('--lines', 200)
+    runs = arg('--runs', 20)
+
+    path = os.path.join(tempfile.mkdtemp(), 'app.log')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(SAMPLE_LINE * int(size_mb * 1024 * 1024 / len(SAMPLE_LINE)))
+    print(f"Log file: {os.path.getsize(path) / 1024 / 1024:.1f} MB, last {lines_to_show} lines, {runs} runs")
+
+    old_ms, (old_lines, old_total) = timed(lambda: old_reader(path, lines_to_show), runs)
+
+    counter = LogIndex(path + '.index.json')
+    first_count_ms, _ = timed(lambda: counter.count(path), 1)
+    new_ms, (new_lines, new_total) = timed(
+        lambda: (tail_lines(path, lines_to_show), counter.count(path)), runs
+    )
+
+    assert old_lines == new_lines and old_total == new_total, "Readers disagree"
+
+    print(f"readlines():        {old_ms:8.2f} ms/request")
+    print(f"tail + counter:     {new_ms:8.2f} ms/request ({old_ms / new_ms:.0f}x faster)")
+    print(f"first count (once): {first_count_ms:8.2f} ms")
+    os.remove(path)
+    os.remove(path + '.index.json')
+
+
+if __name__ == '__main__':
+    main()
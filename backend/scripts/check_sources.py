@@ -0,0 +1,114 @@
+# RUN FROM PROJECT ROOT
+# python -m scripts.check_sources [--refresh] [tour ...]
+#
+# Parses each source's saved fixture page offline (no browser, no network,
+# no database) and prints what would be written. Use it after touching a
+# parser or adding a source. --refresh fetches the live page first and
+# saves it as the new fixture.
+# The ATP check also parses a saved player profile page (profile enrichment).
+
+import sys
+
+from tasks.sources import SOURCES
+
+PROFILE_FIXTURE = 'scripts/rankings_html/atp_profile.html'
+PROFILE_FIXTURE_URL = 'https://www.atptour.com/en/players/jannik-sinner/s0ag/overview'
+
+
+def check_source(source):
+    print(f"=== {source.name} ({source.tour}) ===")
+    try:
+        players_data = source.collect(offline=True)
+    except FileNotFoundError as e:
+        print(f"Skipped: {e}")
+        return None
+
+    if not players_data:
+        print(f"FAILED: no players parsed from {source.fixture_path}")
+        return False
+
+    for player in players_data[:5]:
+        print(f"#{player['rank']} {player['name']} - {player['points']:,} points "
+              f"(id: {player['tour_player_id']})")
+
+    missing_ids = sum(1 for p in players_data if not p['tour_player_id'])
+    print(f"Parsed {len(players_data)} players, {missing_ids} without a tour id")
+    if source.probe_url:
+        ranking_date = source.ranking_date(source.load_fixture())
+        print(f"Ranking week: {ranking_date or 'not in payload (probes fall back to a full fetch)'}")
+
+    for path in source.fixture_variants:
+        variant_data = source.clean(source.parse(source.load_fixture(path)))
+        if variant_data != players_data:
+            print(f"FAILED: {path} parsed differently ({len(variant_data)} players)\n")
+            return False
+        print(f"Same {len(variant_data)} players from {path}")
+    print()
+    return True
+
+
+def check_profile():
+    from tasks.scrapers.profile_enricher import parse_profile_html
+
+    print("=== ATP player profile ===")
+    with open(PROFILE_FIXTURE, 'r', encoding='utf-8') as f:
+        profile = parse_profile_html(f.read())
+    print(profile)
+
+    missing = [field for field, value in profile.items() if value is None]
+    if missing:
+        print(f"FAILED: {', '.join(missing)} not parsed from {PROFILE_FIXTURE}\n")
+        return False
+    print("Parsed every profile field\n")
+    return True
+
+
+def refresh_profile_fixture():
+    from config import Config
+    from tasks.scrapers.atp_scraper import create_chrome_driver, load_page
+    from tasks.scrapers.profile_enricher import PROFILE_READY_MARKER
+
+    print("Fetching live ATP profile page...")
+    driver = create_chrome_driver()
+    try:
+        html_content = load_page(driver, PROFILE_FIXTURE_URL, PROFILE_READY_MARKER,
+                                 Config.PROFILE_PAGE_TIMEOUT_SECONDS)
+    except RuntimeError as e:
+        print(f"Fetch failed ({e}), keeping existing profile fixture")
+        return
+    finally:
+        driver.quit()
+    with open(PROFILE_FIXTURE, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+
+def refresh_fixture(source):
+    print(f"Fetching live {source.name} page...")
+    raw = source.fetch()
+    if raw:
+        source.save_fixture(raw)
+    else:
+        print(f"Fetch failed, keeping existing fixture for {source.tour}")
+
+
+def main():
+    args = sys.argv[1:]
+    refresh = '--refresh' in args
+    tours = [arg for arg in args if arg != '--refresh'] or list(SOURCES)
+
+    if refresh:
+        for tour in tours:
+            refresh_fixture(SOURCES[tour])
+        if 'atp' in tours:
+            refresh_profile_fixture()
+
+    results = [check_source(SOURCES[tour]) for tour in tours]
+    if 'atp' in tours:
+        results.append(check_profile())
+
+    if False in results:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
 from models import User, db
+from routes.api.authentification.user_cache import invalidate_user
 
 def make_admin_by_id(user_id):
     """Set user as admin by ID"""
@@ -34,6 +35,9 @@ def make_admin_by_id(user_id):
             # Set as admin
             user.is_admin = True
             db.session.commit()
+
+            # Running servers drop their cached /me for this user
+            invalidate_user(user.id)
             
             print(f"✅ Successfully set {user.email} (ID: {user_id}) as admin")
             return True
@@ -64,6 +68,9 @@ def make_admin_by_email(email):
             # Set as admin
             user.is_admin = True
             db.session.commit()
+
+            # Running servers drop their cached /me for this user
+            invalidate_user(user.id)
             
             print(f"✅ Successfully set {user.email} (ID: {user.id}) as admin")
             return True
@@ -0,0 +1,180 @@
+# RUN FROM PROJECT ROOT
+# python -m scripts.oauth_standin [--port 6400]
+# python -m scripts.oauth_standin --check
+#
+# Local stand-in for Google's OAuth endpoints, for trying the sign-in flow
+# without Google. Point the app at it with:
+#   GOOGLE_AUTH_URI=http://localhost:6400/auth
+#   GOOGLE_TOKEN_URI=http://localhost:6400/token
+#   GOOGLE_CERTS_URI=http://localhost:6400/certs
+#   GOOGLE_USERINFO_URI=http://localhost:6400/userinfo
+#   OAUTHLIB_INSECURE_TRANSPORT=1   (lets /google/login build a plain-http URL)
+# Any code is accepted; "<anything>:<email>" signs in as <email>.
+# ID tokens are RS256-signed with a key generated at startup.
+# --check runs /api/auth/google/callback against it on a temporary database.
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse, urlencode
+
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+KEY_ID = 'standin-key-1'
+
+
+def generate_key_pair():
+    """(private PEM, public PEM), both PKCS#1 - readable by either google-auth backend"""
+    try:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa as crypto_rsa
+    except ImportError:
+        import rsa
+        public_key, private_key = rsa.newkeys(2048)
+        return private_key.save_pkcs1().decode(), public_key.save_pkcs1().decode()
+
+    private_key = crypto_rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.PKCS1
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def make_server(port, host='127.0.0.1'):
+    private_pem, public_pem = generate_key_pair()
+    signer = crypt.RSASigner.from_string(private_pem, key_id=KEY_ID)
+    certs = {KEY_ID: public_pem}
+    stats = {'token': 0, 'certs': 0, 'userinfo': 0}
+
+    def identity(code):
+        email = code.split(':', 1)[1] if ':' in code else 'standin@example.com'
+        sub = str(int(hashlib.sha256(email.encode()).hexdigest()[:15], 16))
+        return {'sub': sub, 'email': email, 'name': email.split('@')[0].title()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, data, status=200, headers=None):
+            body = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/certs':
+                stats['certs'] += 1
+                return self.send_json(certs, headers={'Cache-Control': 'public, max-age=300'})
+            if url.path == '/auth':
+                # Consent screen: approve straight away
+                query = parse_qs(url.query)
+                location = query['redirect_uri'][0] + '?' + urlencode({
+                    'code': 'standin-code:standin@example.com',
+                    'state': query.get('state', [''])[0]
+                })
+                self.send_response(302)
+                self.send_header('Location', location)
+                self.end_headers()
+                return
+            if url.path == '/userinfo':
+                stats['userinfo'] += 1
+                token = self.headers.get('Authorization', '').replace('Bearer ', '')
+                user = identity(token)
+                return self.send_json({'id': user['sub'], 'email': user['email'], 'name': user['name']})
+            self.send_json({'error': 'not_found'}, status=404)
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/token':
+                return self.send_json({'error': 'not_found'}, status=404)
+            stats['token'] += 1
+            length = int(self.headers.get('Content-Length', 0))
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+            user = identity(form.get('code', ''))
+            now = int(time.time())
+            id_token = google_jwt.encode(signer, {
+                'iss': 'https://accounts.google.com',
+                'aud': form.get('client_id'),
+                'iat': now,
+                'exp': now + 3600,
+                'email_verified': True,
+                **user
+            })
+            self.send_json({
+                'access_token': form.get('code', ''),
+                'id_token': id_token.decode(),
+                'expires_in': 3599,
+                'token_type': 'Bearer'
+            })
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.stats = stats
+    return server
+
+
+def check():
+    server = make_server(0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Must be set before the app (and Config) is imported
+    os.environ.update({
+        'GOOGLE_CLIENT_ID': 'standin-client',
+        'GOOGLE_CLIENT_SECRET': 'standin-secret',
+        'GOOGLE_AUTH_URI': f"{base}/auth",
+        'GOOGLE_TOKEN_URI': f"{base}/token",
+        'GOOGLE_CERTS_URI': f"{base}/certs",
+        'GOOGLE_USERINFO_URI': f"{base}/userinfo",
+        'OAUTHLIB_INSECURE_TRANSPORT': '1',
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'oauth_check.db'),
+        'JWT_SECRET': os.environ.get('JWT_SECRET') or 'standin-jwt-secret-' + 'x' * 32
+    })
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    for attempt in range(3):
+        start = time.perf_counter()
+        response = client.post('/api/auth/google/callback', json={'code': 'c:player@example.com'})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, response.json
+        print(f"Callback {attempt + 1}: {response.status_code} {response.json['user']['email']} "
+              f"in {elapsed_ms:.0f}ms")
+
+    login = client.get('/api/auth/google/login').json
+    assert login['auth_url'].startswith(f"{base}/auth")
+
+    print(f"Stand-in calls: {server.stats}")
+    assert server.stats['certs'] == 1 and server.stats['userinfo'] == 0
+    server.shutdown()
+    print("✅ Google callback verified ID tokens locally with cached certificates")
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv:
+        check()
+        sys.exit(0)
+
+    port = int(sys.argv[sys.argv.index('--port') + 1]) if '--port' in sys.argv else 6400
+    print(f"OAuth stand-in listening on http://127.0.0.1:{port}")
+    make_server(port).serve_forever()
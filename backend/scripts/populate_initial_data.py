@@ -6,11 +6,11 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 
 import os
 
 from models import Player, db
+from tasks.scrapers.parsers import parse_with_strategies
 # Have to have an application context in order to connect to DB
 # create_app()
 # Flask-SQLAlchemy requires an application context to know:
@@ -38,7 +38,7 @@ from app import create_app
 # 4 functions.
 # main(): Run everything
 # fetch_atp_rankings(): Gets the players
-# parse_rankings_html(): parses for information
+# parse_rankings_html(): parses for information (strategies in tasks/scrapers/parsers.py)
 # add_to_db(): Adds players to DB
 
 
@@ -93,38 +93,23 @@ def fetch_atp_rankings():
     
 
 def parse_rankings_html(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    players_data = []
-    
     print("Parsing HTML content...")
-    
-    # First, let's find the actual structure by looking for ranking data
-    # ATP might use different selectors, so we'll try multiple approaches
-    
-    # Try approach 1: Look for table rows
-    ranking_rows = soup.find_all('tr')
-    if ranking_rows:
-        print(f"Found {len(ranking_rows)} table rows, attempting to parse...")
-        players_data = parse_table_structure(ranking_rows)
 
-    # If no data found, try approach 2: Look for div-based structure
-    if not players_data:
-        print("No data in table rows, trying div-based structure...")
-        ranking_divs = soup.find_all('div', class_=lambda x: x and 'player' in x.lower())
-        if ranking_divs:
-            print(f"Found {len(ranking_divs)} player divs, attempting to parse...")
-            players_data = parse_div_structure(ranking_divs)
-    
-    # If still no data, print some debug info
+    # The registry picks the layout from a quick fingerprint check and tries
+    # the last successful strategy first (see tasks/scrapers/parsers.py)
+    players_data, strategy = parse_with_strategies(html_content)
+
+    # If no data, print some debug info
     if not players_data:
         print("No ranking data found. Debug info:")
-        print(f"Page title: {soup.title.get_text() if soup.title else 'No title'}")
         print(f"Page contains 'rankings': {'rankings' in html_content.lower()}")
         print(f"Page contains 'player': {'player' in html_content.lower()}")
         
         # Print first 1000 characters for debugging
         print("First 1000 characters of page:")
         print(html_content[:1000])
+    else:
+        print(f"Layout detected with '{strategy}' strategy")
     
     print(f"\nSuccessfully parsed {len(players_data)} players")
     
@@ -137,115 +122,6 @@ def parse_rankings_html(html_content):
 
     return unique_players
 
-def parse_table_structure(rows):
-    """
-    Try to parse table-based ranking structure
-    """
-    players_data = []
-    
-    for row in rows:
-        try:
-            # Look for rank
-            rank_cell = row.find('td', class_=lambda x: x and 'rank' in x.lower())
-            if not rank_cell:
-                continue
-            
-            rank_text = rank_cell.get_text(strip=True)
-            if not rank_text.isdigit():
-                continue
-            rank = int(rank_text)
-            
-            # Look for name - try multiple selectors
-            name = None
-            name_selectors = [
-                'li.name span.lastName',
-                'td .player-name',
-                'td .name',
-                '.lastName'
-            ]
-            
-            for selector in name_selectors:
-                name_element = row.select_one(selector)
-                if name_element:
-                    name = name_element.get_text(strip=True)
-                    break
-            
-            if not name:
-                continue
-            
-            # Look for points
-            points = None
-            points_selectors = [
-                'td.points',
-                'td .points',
-                '.points'
-            ]
-            
-            for selector in points_selectors:
-                points_element = row.select_one(selector)
-                if points_element:
-                    points_text = points_element.get_text(strip=True)
-                    # Remove commas and convert to integer
-                    points = int(points_text.replace(',', '').replace('.', ''))
-                    break
-            
-            if points is None:
-                continue
-            
-            player_data = {
-                'rank': rank,
-                'name': name,
-                'points': points
-            }
-            
-            players_data.append(player_data)
-            print(f"Parsed: #{rank} {name} - {points:,} points")
-            
-        except (ValueError, AttributeError) as e:
-            continue
-    
-    return players_data
-
-def parse_div_structure(divs):
-    """
-    Try to parse div-based ranking structure
-    """
-    players_data = []
-    
-    for div in divs:
-        try:
-            # Look for rank, name, and points within the div
-            rank_element = div.find(class_=lambda x: x and 'rank' in x.lower())
-            name_element = div.find(class_=lambda x: x and 'name' in x.lower())
-            points_element = div.find(class_=lambda x: x and 'point' in x.lower())
-            
-            if not all([rank_element, name_element, points_element]):
-                continue
-            
-            rank_text = rank_element.get_text(strip=True)
-            if not rank_text.isdigit():
-                continue
-            rank = int(rank_text)
-            
-            name = name_element.get_text(strip=True)
-            
-            points_text = points_element.get_text(strip=True)
-            points = int(points_text.replace(',', '').replace('.', ''))
-            
-            player_data = {
-                'rank': rank,
-                'name': name,
-                'points': points
-            }
-            
-            players_data.append(player_data)
-            print(f"Parsed: #{rank} {name} - {points:,} points")
-            
-        except (ValueError, AttributeError) as e:
-            continue
-    
-    return players_data
-
 def save_players_to_db(players_data):
     """
     Save player data to the database
@@ -256,7 +132,7 @@ def save_players_to_db(players_data):
         try:
             # Clear existing data more explicitly
             print("Clearing existing player data...")
-            db.session.query(Player).delete()
+            db.session.query(Player).filter_by(tour='atp').delete()
             db.session.commit()  # Commit the deletion immediately
             print("Existing data cleared successfully")
             
@@ -266,7 +142,10 @@ def save_players_to_db(players_data):
                 player = Player(
                     ranking=player_data['rank'],  # Changed from 'rank' to 'ranking'
                     name=player_data['name'],
-                    points=player_data['points']
+                    points=player_data['points'],
+                    tour='atp',
+                    tour_player_id=player_data.get('atp_id'),
+                    slug=player_data.get('slug')
                 )
                 db.session.add(player)
             
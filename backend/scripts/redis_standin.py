@@ -0,0 +1,169 @@
+# RUN FROM PROJECT ROOT
+# python -m scripts.redis_standin [--port 6390] [--max-keys 10000]
+# python -m scripts.redis_standin --check
+#
+# Tiny in-memory server speaking the subset of the Redis protocol the app
+# uses (GET/SET/DEL/INCRBY/PEXPIRE/...). Lets you run several app
+# processes with CACHE_BACKEND=redis CACHE_URL=redis://localhost:6390/0
+# without installing Redis. Not for production: no persistence, one lock.
+# --check starts it on a free port and exercises RedisCache against it.
+
+import sys
+import time
+import threading
+import socketserver
+from collections import OrderedDict
+
+from utils.cache import RedisCache
+
+
+class Store:
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.data = OrderedDict()   # key -> [value bytes, expires_at or None]
+        self.evicted_keys = 0
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def _put(self, key, value, expires_at):
+        self.data[key] = [value, expires_at]
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_keys:
+            self.data.popitem(last=False)
+            self.evicted_keys += 1
+
+    def command(self, args):
+        name = args[0].decode().upper()
+        with self.lock:
+            if name == 'PING':
+                return '+PONG'
+            if name in ('SELECT', 'AUTH'):
+                return '+OK'
+            if name == 'GET':
+                entry = self._live(args[1])
+                return entry[0] if entry else None
+            if name == 'SET':
+                expires_at = None
+                options = [arg.decode().upper() for arg in args[3:]]
+                if 'EX' in options:
+                    expires_at = time.monotonic() + int(options[options.index('EX') + 1])
+                if 'PX' in options:
+                    expires_at = time.monotonic() + int(options[options.index('PX') + 1]) / 1000
+                self._put(args[1], args[2], expires_at)
+                return '+OK'
+            if name == 'DEL':
+                return sum(1 for key in args[1:] if self._live(key) and self.data.pop(key))
+            if name in ('INCR', 'INCRBY'):
+                amount = int(args[2]) if name == 'INCRBY' else 1
+                entry = self._live(args[1]) or [b'0', None]
+                value = int(entry[0]) + amount
+                self._put(args[1], str(value).encode(), entry[1])
+                return value
+            if name in ('EXPIRE', 'PEXPIRE'):
+                entry = self._live(args[1])
+                if not entry:
+                    return 0
+                seconds = int(args[2]) / (1000 if name == 'PEXPIRE' else 1)
+                entry[1] = time.monotonic() + seconds
+                return 1
+            if name == 'PTTL':
+                entry = self._live(args[1])
+                if not entry:
+                    return -2
+                return -1 if entry[1] is None else int((entry[1] - time.monotonic()) * 1000)
+            if name == 'DBSIZE':
+                return len(self.data)
+            if name == 'FLUSHDB':
+                self.data.clear()
+                return '+OK'
+            if name == 'INFO':
+                return f"# Stats\r\nevicted_keys:{self.evicted_keys}\r\n".encode()
+        return f"-ERR unknown command '{name}'"
+
+
+def encode_reply(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return f":{reply}\r\n".encode()
+    if isinstance(reply, bytes):
+        return f"${len(reply)}\r\n".encode() + reply + b"\r\n"
+    return f"{reply}\r\n".encode()   # simple string or error (+OK / -ERR)
+
+
+def read_command(reader):
+    line = reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b'*'):
+        return line.split()        # inline command (e.g. typed into telnet)
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int(reader.readline()[1:-2])
+        args.append(reader.read(length + 2)[:-2])
+    return args
+
+
+def make_server(port, max_keys=10000, host='127.0.0.1'):
+    store = Store(max_keys)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            while True:
+                args = read_command(self.rfile)
+                if not args:
+                    return
+                self.wfile.write(encode_reply(store.command(args)))
+
+    class Server(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    return Server((host, port), Handler)
+
+
+def check():
+    server = make_server(0, max_keys=3)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    cache = RedisCache(f"redis://127.0.0.1:{port}/0", prefix='check:')
+
+    cache.set('page', {'players': [1, 2, 3]})
+    assert cache.get('page') == {'players': [1, 2, 3]}
+    assert cache.get('missing') is None
+
+    cache.set('short', 1, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get('short') is None
+
+    assert cache.incr('counter', ttl=60) == 1
+    assert cache.incr('counter', 4) == 5
+
+    cache.delete('page')
+    assert cache.get('page') is None
+
+    for i in range(5):
+        cache.set(f"fill{i}", i)
+
+    stats = cache.stats()
+    print(stats)
+    assert stats['evictions'] > 0 and stats['entries'] == 3
+    server.shutdown()
+    print("✅ RedisCache works against the stand-in")
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv:
+        check()
+        sys.exit(0)
+
+    port = int(sys.argv[sys.argv.index('--port') + 1]) if '--port' in sys.argv else 6390
+    max_keys = int(sys.argv[sys.argv.index('--max-keys') + 1]) if '--max-keys' in sys.argv else 10000
+    print(f"Redis stand-in listening on 127.0.0.1:{port} (max {max_keys} keys)")
+    make_server(port, max_keys).serve_forever()
@@ -0,0 +1,88 @@
+"""
+Post-ingest cache warming
+Modules that cache data derived from the rankings register a warmer here.
+After an ingest, every warmer builds its artifacts for the new data
+version, and only then is the version published to readers - so the
+switch to a new week happens with every cache already hot.
+"""
+
+import time
+import logging
+
+from tasks.data_version import bump_version, on_version_change
+
+# Data version shared with other processes (see tasks/data_version.py)
+RANKINGS_VERSION = 'rankings'
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+# name -> warmer(version, tours); registration order is run order
+CACHE_WARMERS = {}
+
+# name -> publish(version); called once every warmer has finished
+VERSION_LISTENERS = {}
+
+
+def cache_warmer(name):
+    """Register `func(version, tours)` to pre-build cached artifacts"""
+    def decorator(func):
+        CACHE_WARMERS[name] = func
+        return func
+    return decorator
+
+
+def version_listener(name):
+    """Register `func(version)` to switch readers to a warmed version"""
+    def decorator(func):
+        VERSION_LISTENERS[name] = func
+        return func
+    return decorator
+
+
+def new_data_version():
+    """Monotonic version id for a freshly ingested dataset"""
+    return time.time_ns()
+
+
+def warm_and_publish(tours):
+    """
+    Build every registered artifact for a new version, then publish it
+    A failing warmer is logged and skipped; its cache fills lazily instead.
+    Returns the published version.
+    """
+    version = new_data_version()
+    start_time = time.monotonic()
+
+    for name, warmer in CACHE_WARMERS.items():
+        try:
+            warmer(version, tours)
+        except Exception as e:
+            logger.error(f"Cache warmer '{name}' failed: {str(e)}", exc_info=True)
+
+    for name, publish in VERSION_LISTENERS.items():
+        publish(version)
+
+    # Tell other workers their cached rankings are out of date
+    try:
+        bump_version(RANKINGS_VERSION, version)
+    except Exception as e:
+        logger.error(f"Could not publish data version {version}: {str(e)}")
+
+    elapsed_ms = (time.monotonic() - start_time) * 1000
+    logger.info(
+        f"🔥 Caches warmed and version {version} published in {elapsed_ms:.0f}ms "
+        f"({', '.join(CACHE_WARMERS) or 'no warmers'})"
+    )
+    return version
+
+
+@on_version_change(RANKINGS_VERSION)
+def publish_remote_version(version):
+    """
+    Another process ingested new rankings
+    Nothing is warmed here: cached entries become stale and are rebuilt
+    on demand (one request per entry - see routes/api/rankings/cache.py).
+    """
+    for name, publish in VERSION_LISTENERS.items():
+        publish(version)
@@ -0,0 +1,94 @@
+"""
+Cross-process cache invalidation
+Each cached dataset has a row in data_versions. The process that changes
+the data bumps the row; every process reads the table at most once per
+DATA_VERSION_POLL_SECONDS (one small SELECT) and runs the change handlers
+for any version it hasn't seen, so all workers pick up new data within
+seconds without a restart. A version only counts as seen once all its
+handlers succeeded; a failed refresh is retried on the next poll. Works the same on SQLite and PostgreSQL.
+"""
+
+import time
+import logging
+import threading
+
+from sqlalchemy.exc import IntegrityError
+
+from config import Config
+from models import DataVersion, db
+from tasks.leader_lock import utcnow
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+# name -> [handler(version)]
+_handlers = {}
+# name -> last version this process has acted on
+_seen = {}
+
+_poll_lock = threading.Lock()
+_last_poll = 0.0
+
+
+def on_version_change(name):
+    """Register `func(version)` to run when `name` is bumped by any process"""
+    def decorator(func):
+        _handlers.setdefault(name, []).append(func)
+        return func
+    return decorator
+
+
+def bump_version(name, version):
+    """
+    Publish a new version of `name` to every process
+    The caller has already refreshed its own caches, so its handlers don't run.
+    """
+    _seen[name] = version
+    values = {'version': version, 'updated_at': utcnow()}
+
+    try:
+        updated = DataVersion.query.filter_by(name=name).update(values, synchronize_session=False)
+        if not updated:
+            db.session.add(DataVersion(name=name, **values))
+        db.session.commit()
+    except IntegrityError:
+        # Another process inserted the row first - overwrite it
+        db.session.rollback()
+        DataVersion.query.filter_by(name=name).update(values, synchronize_session=False)
+        db.session.commit()
+
+
+def poll_versions(force=False):
+    """
+    Run handlers for versions bumped elsewhere
+    Cheap to call on every request: at most one query per poll interval,
+    and only one thread per process polls at a time.
+    """
+    global _last_poll
+
+    if not force and time.monotonic() - _last_poll < Config.DATA_VERSION_POLL_SECONDS:
+        return
+    if not _poll_lock.acquire(blocking=False):
+        return
+
+    try:
+        _last_poll = time.monotonic()
+        rows = db.session.query(DataVersion.name, DataVersion.version).all()
+        for name, version in rows:
+            if _seen.get(name) == version:
+                continue
+            try:
+                for handler in _handlers.get(name, []):
+                    handler(version)
+            except Exception as e:
+                # Leave the version unseen so the next poll runs its handlers again
+                db.session.rollback()
+                logger.warning(f"Refreshing data version '{name}' failed, retrying next poll: {str(e)}")
+                continue
+            _seen[name] = version
+            logger.info(f"🔄 Data version '{name}' changed - local caches refreshed")
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Data version poll failed: {str(e)}")
+    finally:
+        _poll_lock.release()
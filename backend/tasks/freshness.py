@@ -0,0 +1,128 @@
+"""
+Publish detection for ranking sources
+Rankings come out on Monday, but not at a fixed time. Instead of one
+blind scrape, the scheduler opens a publish window and probes each source
+on a backoff schedule, running the full update only once new data shows up.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+
+from models import SourceState, db
+from tasks.sources import SOURCES
+from tasks.leader_lock import utcnow
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+def data_fingerprint(players_data):
+    """Hash of every row (rank, name, points) of a cleaned rankings list"""
+    rows = sorted(players_data, key=lambda p: p['rank'])
+    key = "|".join(f"{p['rank']}:{p['name']}:{p['points']}" for p in rows)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+############################ SOURCE STATE ############################
+def get_source_state(tour):
+    """Return the state row for `tour`, creating it (unsaved) if missing"""
+    state = db.session.get(SourceState, tour)
+    if state is None:
+        state = SourceState(tour=tour)
+        db.session.add(state)
+    return state
+
+
+def record_ingest(tour, fingerprint, changed):
+    """Store the fingerprint after a full fetch; stamp last_ingest_at on change"""
+    state = get_source_state(tour)
+    state.fingerprint = fingerprint
+    if changed:
+        state.last_ingest_at = utcnow()
+    db.session.commit()
+
+
+############################ PUBLISH WINDOW ############################
+def current_window_start(config, now=None):
+    """Start of the most recent publish window (naive UTC)"""
+    now = now or utcnow()
+    weekday = WEEKDAYS.index(config['PUBLISH_WINDOW_DAY'])
+    start = (now - timedelta(days=(now.weekday() - weekday) % 7)).replace(
+        hour=config['PUBLISH_WINDOW_START_HOUR'], minute=0, second=0, microsecond=0
+    )
+    if start > now:
+        start -= timedelta(days=7)
+    return start
+
+
+def window_is_open(config, now=None):
+    now = now or utcnow()
+    start = current_window_start(config, now)
+    return now < start + timedelta(hours=config['PUBLISH_WINDOW_HOURS'])
+
+
+def pending_tours(config):
+    """Sources that haven't ingested new rankings since the window opened"""
+    window_start = current_window_start(config)
+    pending = []
+    for tour in SOURCES:
+        state = db.session.get(SourceState, tour)
+        if not state or not state.last_ingest_at or state.last_ingest_at < window_start:
+            pending.append(tour)
+    return pending
+
+
+def probe_delay_minutes(config, attempt):
+    """Exponential backoff: base, 2x base, 4x base ... capped"""
+    return min(
+        config['PROBE_BASE_MINUTES'] * (2 ** attempt),
+        config['PROBE_MAX_MINUTES']
+    )
+
+
+############################ PROBING ############################
+def probe_for_new_data(tour, config):
+    """
+    Cheap check whether `tour` has published this window's rankings
+    Returns True (new data), False (unchanged) or None (can't tell cheaply /
+    probe failed - caller should fall back to a full fetch)
+    The probe only sees the top of the list, which often doesn't move in a
+    week, so it goes by the payload's ranking date rather than its rows.
+    """
+    source = SOURCES[tour]
+    state = get_source_state(tour)
+
+    try:
+        result = source.probe(state.probe_etag, state.probe_last_modified)
+    except Exception as e:
+        logger.warning(f"[{tour}] Probe failed: {str(e)}")
+        return None
+    finally:
+        # Commit on every path: a pending SourceState insert would keep the
+        # write transaction open while the probe job reschedules itself
+        # through the job store's own connection ("database is locked")
+        state.last_probe_at = utcnow()
+        db.session.commit()
+
+    if result is None:
+        return None
+
+    state.probe_etag = result['etag']
+    state.probe_last_modified = result['last_modified']
+    db.session.commit()
+
+    if result['not_modified']:
+        logger.info(f"[{tour}] Probe: not modified")
+        return False
+
+    ranking_date = source.ranking_date(result['raw'])
+    if ranking_date is None:
+        logger.info(f"[{tour}] Probe: no ranking date in payload - full fetch needed")
+        return None
+
+    published = ranking_date >= current_window_start(config).date()
+    logger.info(f"[{tour}] Probe: {'NEW rankings detected' if published else 'unchanged'} (week of {ranking_date})")
+    return published
@@ -0,0 +1,148 @@
+"""
+Rankings ingest
+Runs every registered source in parallel and writes each tour's rankings.
+"""
+
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+from models import Player, db
+from tasks.sources import SOURCES
+from tasks.freshness import data_fingerprint, get_source_state, record_ingest
+from tasks.cache_warming import warm_and_publish
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+# Lease held by whichever run is scraping (manual job or scheduled probe), in any process
+SCRAPE_LOCK_NAME = 'rankings_scrape'
+
+
+def scrape_and_update_rankings(tours=None):
+    """
+    Main function called by scheduler
+    `tours` limits the run to some sources (default: all)
+    Returns True if every requested source succeeded, False otherwise
+    """
+    results = scrape_and_update_tours(tours)
+    return all(results.values())
+
+
+def scrape_and_update_tours(tours=None, on_stage=None, only_if_changed=False):
+    """
+    Fetch all requested sources in parallel, then update the database
+    one tour at a time on this thread (the session is not thread-safe)
+    `on_stage(stage)` is called as the run progresses (used for job status)
+    `only_if_changed` skips the write when the data matches the last ingest
+    Returns {tour: success}
+    """
+    tours = list(tours or SOURCES)
+    report_stage = on_stage or (lambda stage: None)
+    logger.info(f"=== Starting rankings update for: {', '.join(tours)} ===")
+    start_time = datetime.now()
+
+    # Step 1: Scrape the data (network bound, runs in parallel)
+    report_stage('fetching')
+    with ThreadPoolExecutor(max_workers=len(tours)) as executor:
+        futures = {tour: executor.submit(collect_source, tour) for tour in tours}
+        collected = {tour: future.result() for tour, future in futures.items()}
+
+    # Step 2: Update database (only for sources that scraped successfully)
+    results = {}
+    written = []
+    for tour in tours:
+        players_data = collected[tour]
+        if not players_data:
+            logger.error(f"[{tour}] SCRAPE FAILED: No player data retrieved")
+            results[tour] = False
+            continue
+
+        try:
+            fingerprint = data_fingerprint(players_data)
+            changed = fingerprint != get_source_state(tour).fingerprint
+            if only_if_changed and not changed:
+                logger.info(f"[{tour}] Rankings unchanged since last ingest - skipping write")
+                results[tour] = True
+                continue
+
+            report_stage(f'updating:{tour}')
+            logger.info(f"[{tour}] Updating database...")
+            update_database(players_data, tour)
+            record_ingest(tour, fingerprint, changed)
+            results[tour] = True
+            written.append(tour)
+
+            # Log summary
+            top_3 = players_data[:3]
+            summary = " | ".join([f"#{p['rank']} {p['name']} ({p['points']})" for p in top_3])
+            logger.info(f"[{tour}] Top 3: {summary}")
+        except Exception as e:
+            logger.error(f"[{tour}] UPDATE FAILED: {str(e)}", exc_info=True)
+            results[tour] = False
+
+    # Step 3: Rebuild caches for the new data before readers switch to it
+    if written:
+        report_stage('warming_caches')
+        warm_and_publish(written)
+
+    execution_time = (datetime.now() - start_time).total_seconds()
+    succeeded = [tour for tour, ok in results.items() if ok]
+    logger.info(
+        f"=== UPDATE FINISHED in {execution_time:.1f}s: "
+        f"{len(succeeded)}/{len(tours)} sources succeeded ==="
+    )
+    return results
+
+
+def collect_source(tour):
+    """Fetch and parse one source (runs on a worker thread, no DB access)"""
+    source = SOURCES[tour]
+    try:
+        logger.info(f"[{tour}] Fetching {source.name} rankings data...")
+        players_data = source.collect()
+        logger.info(f"[{tour}] SCRAPE SUCCESS: Retrieved {len(players_data)} players")
+        return players_data
+    except Exception as e:
+        logger.error(f"[{tour}] Error during scraping: {str(e)}", exc_info=True)
+        return []
+
+
+def update_database(players_data, tour):
+    """
+    Update database with new rankings data for one tour
+    Uses replace strategy for simplicity
+    """
+    logger.info(f"[{tour}] Starting database transaction...")
+
+    try:
+        # Get current count before deletion
+        current_count = Player.query.filter_by(tour=tour).count()
+        logger.info(f"[{tour}] Current database contains {current_count} players")
+
+        # Clear existing data for this tour only
+        Player.query.filter_by(tour=tour).delete()
+        logger.info(f"[{tour}] Deleted {current_count} existing records")
+
+        # Insert new data
+        now = datetime.now(timezone.utc)
+        for player_data in players_data:
+            player = Player(
+                tour=tour,
+                ranking=player_data['rank'],
+                name=player_data['name'],
+                points=player_data['points'],
+                tour_player_id=player_data.get('tour_player_id'),
+                slug=player_data.get('slug'),
+                last_updated=now
+            )
+            db.session.add(player)
+
+        # Commit transaction
+        db.session.commit()
+        logger.info(f"[{tour}] Successfully inserted {len(players_data)} new records")
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[{tour}] Database update failed: {str(e)}")
+        raise
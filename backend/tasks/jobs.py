@@ -0,0 +1,145 @@
+"""
+On-demand rankings update jobs
+The admin trigger enqueues a job and returns immediately; the update runs
+on a background thread and reports its stage in the scrape_jobs table.
+Triggers while an update is already queued or running (in any process)
+are coalesced onto that job. Jobs hold the same scrape lock as the
+scheduled probe, so a manual run never overlaps a scheduled scrape.
+"""
+
+import logging
+import threading
+import uuid
+
+from flask import current_app
+
+from models import ScrapeJob, db
+from tasks.ingest import scrape_and_update_tours, SCRAPE_LOCK_NAME
+from tasks.leader_lock import acquire_exclusive, release, is_lock_held, utcnow
+from tasks.runner import submit
+from tasks.scheduler import run_profile_enrichment
+from utils.logging_config import log_job_execution
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+# One enqueue at a time per process; the DB lock covers other processes
+_enqueue_lock = threading.Lock()
+
+
+def scrape_lock_owner(job_id):
+    """Owner token of a job's scrape lease, so any process can check on it"""
+    return f"job:{job_id}"
+
+
+def enqueue_manual_update(requested_by=None, tours=None):
+    """
+    Queue a rankings update unless one is already active
+    Returns (job_dict, created). created is False when coalesced.
+    """
+    with _enqueue_lock:
+        active = get_active_job()
+        if active:
+            return active.to_dict(), False
+
+        # Cross-process mutex, held for the whole run and released by the worker
+        job_id = uuid.uuid4().hex
+        if not acquire_exclusive(SCRAPE_LOCK_NAME, current_app.config['SCRAPE_LOCK_TTL_SECONDS'],
+                                 scrape_lock_owner(job_id)):
+            # Another process just won the race (its job row is already
+            # committed), or the scheduled probe is scraping
+            active = get_active_job()
+            if active:
+                return active.to_dict(), False
+            raise RuntimeError("A rankings update is already running - try again shortly")
+
+        job = ScrapeJob(
+            id=job_id,
+            state='queued',
+            stage='queued',
+            tours=",".join(tours) if tours else None,
+            requested_by=requested_by,
+            created_at=utcnow()
+        )
+        db.session.add(job)
+        db.session.commit()
+        job_data = job.to_dict()
+
+    logger.info(f"Manual rankings update queued (job {job.id})")
+    submit(run_manual_update, job.id, tours)
+    return job_data, True
+
+
+def get_active_job():
+    """
+    Most recent queued/running job
+    A job whose process died (its lease expired) is marked failed instead
+    """
+    job = (
+        ScrapeJob.query
+        .filter(ScrapeJob.state.in_(['queued', 'running']))
+        .order_by(ScrapeJob.created_at.desc())
+        .first()
+    )
+    if job and not is_lock_held(SCRAPE_LOCK_NAME, scrape_lock_owner(job.id)):
+        set_job_state(
+            job.id,
+            state='failed',
+            error='Abandoned: worker stopped before finishing',
+            finished_at=utcnow()
+        )
+        return None
+    return job
+
+
+def get_job(job_id):
+    return db.session.get(ScrapeJob, job_id)
+
+
+def run_manual_update(job_id, tours=None):
+    """Runner body: run the update and record progress (own app context)"""
+    atp_updated = False
+    try:
+        set_job_state(job_id, state='running', stage='starting', started_at=utcnow())
+
+        results = scrape_and_update_tours(
+            tours,
+            on_stage=lambda stage: set_job_state(job_id, stage=stage)
+        )
+
+        atp_updated = results.get('atp', False)
+        failed_tours = [tour for tour, ok in results.items() if not ok]
+        if failed_tours:
+            set_job_state(
+                job_id,
+                state='failed',
+                stage='done',
+                error=f"Update failed for: {', '.join(failed_tours)}",
+                finished_at=utcnow()
+            )
+            log_job_execution("Manual Rankings Update", False, f"Job {job_id} failed for {failed_tours}")
+        else:
+            set_job_state(job_id, state='succeeded', stage='done', finished_at=utcnow())
+            log_job_execution("Manual Rankings Update", True, f"Job {job_id}")
+
+    except Exception as e:
+        logger.error(f"Manual update job {job_id} crashed: {str(e)}", exc_info=True)
+        db.session.rollback()
+        set_job_state(job_id, state='failed', error=str(e), finished_at=utcnow())
+    finally:
+        release(SCRAPE_LOCK_NAME, scrape_lock_owner(job_id))
+
+    if atp_updated:
+        # New players need profiles, as after a scheduled update. Runs after
+        # the job is finished: enrichment can outlast the scrape lease.
+        run_profile_enrichment()
+
+
+def set_job_state(job_id, **fields):
+    """Update job columns and commit so other workers see progress immediately"""
+    try:
+        ScrapeJob.query.filter_by(id=job_id).update(fields, synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Could not update job {job_id}: {str(e)}")
@@ -0,0 +1,215 @@
+"""
+DB-backed leader lock
+Every app process runs an elector thread; the one holding the lease runs
+the scheduler. The lease is renewed well before it expires, so a crashed
+leader is replaced within one TTL.
+
+The same table holds one-off exclusive leases (acquire_exclusive): each
+acquisition gets its own owner token, so two callers in one process
+exclude each other too, and one can't release the other's lease.
+"""
+
+import os
+import socket
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from models import SchedulerLock, db
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+# Unique per process, readable in the admin panel
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def utcnow():
+    # Lock timestamps are naive UTC so SQLite and PostgreSQL compare the same way
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def try_acquire(name, ttl_seconds):
+    """
+    Acquire or renew the lease on `name`
+    Returns True if this process holds it afterwards
+    """
+    now = utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    try:
+        # Renew our own lease or take over an expired one in a single statement
+        updated = (
+            SchedulerLock.query
+            .filter(SchedulerLock.name == name)
+            .filter(db.or_(
+                SchedulerLock.owner == WORKER_ID,
+                SchedulerLock.expires_at < now
+            ))
+            .update({
+                'owner': WORKER_ID,
+                'expires_at': expires_at,
+                'acquired_at': db.case(
+                    (SchedulerLock.owner == WORKER_ID, SchedulerLock.acquired_at),
+                    else_=now
+                )
+            }, synchronize_session=False)
+        )
+        db.session.commit()
+        if updated:
+            return True
+
+        # No row yet: first process to insert wins
+        if db.session.get(SchedulerLock, name) is None:
+            db.session.add(SchedulerLock(
+                name=name,
+                owner=WORKER_ID,
+                acquired_at=now,
+                expires_at=expires_at
+            ))
+            db.session.commit()
+            return True
+
+        return False
+
+    except IntegrityError:
+        db.session.rollback()
+        return False
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Leader lock '{name}' check failed: {str(e)}")
+        return False
+
+
+def acquire_exclusive(name, ttl_seconds, owner=None):
+    """
+    Take the lease on `name` only if nobody holds it, this process included
+    Returns the owner token to pass to release() and is_lock_held(), or None
+    """
+    owner = owner or f"{WORKER_ID}:{uuid.uuid4().hex[:8]}"
+    now = utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    try:
+        # Only an expired lease can be taken over - never renewed
+        updated = (
+            SchedulerLock.query
+            .filter(SchedulerLock.name == name)
+            .filter(SchedulerLock.expires_at < now)
+            .update({
+                'owner': owner,
+                'acquired_at': now,
+                'expires_at': expires_at
+            }, synchronize_session=False)
+        )
+        db.session.commit()
+        if updated:
+            return owner
+
+        if db.session.get(SchedulerLock, name) is None:
+            db.session.add(SchedulerLock(
+                name=name,
+                owner=owner,
+                acquired_at=now,
+                expires_at=expires_at
+            ))
+            db.session.commit()
+            return owner
+
+        return None
+
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Lock '{name}' acquisition failed: {str(e)}")
+        return None
+
+
+def release(name, owner=WORKER_ID):
+    """Give up the lease so another process can take over immediately"""
+    try:
+        SchedulerLock.query.filter_by(name=name, owner=owner).delete()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Releasing leader lock '{name}' failed: {str(e)}")
+
+
+def is_lock_held(name, owner=None):
+    """True if any process (or `owner`, if given) holds an unexpired lease on `name`"""
+    lock = db.session.get(SchedulerLock, name)
+    return (
+        lock is not None
+        and lock.expires_at > utcnow()
+        and (owner is None or lock.owner == owner)
+    )
+
+
+def get_lock(name):
+    """Current lock row as a dict, or None"""
+    lock = db.session.get(SchedulerLock, name)
+    return lock.to_dict() if lock else None
+
+
+class LeaderElector:
+    """
+    Background thread that keeps trying to hold the lease
+    on_elected / on_demoted are called on this thread when leadership changes
+    """
+    def __init__(self, app, name, ttl_seconds, on_elected, on_demoted):
+        self.app = app
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.is_leader = False
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run,
+            name=f"leader-elector-{name}",
+            daemon=True
+        )
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join(timeout=5)
+        with self.app.app_context():
+            if self.is_leader:
+                self.is_leader = False
+                self.on_demoted()
+                release(self.name)
+            db.session.remove()
+
+    def run(self):
+        # Renew three times per TTL so one slow round doesn't lose the lease
+        interval = max(self.ttl_seconds / 3, 1)
+        while not self.stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.tick()
+                except Exception as e:
+                    # Keep the elector alive; the next round retries
+                    logger.error(f"Leader election round failed: {str(e)}", exc_info=True)
+                finally:
+                    db.session.remove()
+            self.stop_event.wait(interval)
+
+    def tick(self):
+        holds_lease = try_acquire(self.name, self.ttl_seconds)
+
+        if holds_lease and not self.is_leader:
+            self.is_leader = True
+            logger.info(f"👑 {WORKER_ID} elected leader for '{self.name}'")
+            self.on_elected()
+        elif not holds_lease and self.is_leader:
+            self.is_leader = False
+            logger.warning(f"⚠️  {WORKER_ID} lost leadership for '{self.name}'")
+            self.on_demoted()
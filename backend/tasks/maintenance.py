@@ -0,0 +1,32 @@
+"""
+Housekeeping jobs
+Small daily clean-ups run by the leader's scheduler.
+"""
+
+import logging
+
+from models import RefreshToken, RevokedToken, db
+from routes.api.authentification.revocation import refresh_revocations
+from tasks.leader_lock import utcnow
+from tasks.runner import app_context_job
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+
+@app_context_job
+def prune_expired_tokens_job():
+    """Delete refresh tokens and revocations past their expiry"""
+    now = utcnow()
+    removed = RefreshToken.query.filter(RefreshToken.expires_at <= now).delete(
+        synchronize_session=False
+    )
+    # A revoked token that has expired is rejected on its exp alone
+    unrevoked = RevokedToken.query.filter(RevokedToken.expires_at <= now).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    if unrevoked:
+        # Drop them from every process's in-memory list and Bloom filter as well
+        refresh_revocations()
+    logger.info(f"🧹 Pruned {removed} expired refresh tokens and {unrevoked} revocations")
@@ -0,0 +1,80 @@
+"""
+Background job runner
+Scheduled and on-demand jobs run on worker threads that Flask knows
+nothing about. Everything here pushes a fresh app context per job, so each
+job gets its own scoped session, and removes that session when the job
+ends, so nothing leaks into (or contends with) request-thread sessions.
+"""
+
+import logging
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+
+from models import db
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+_app = None
+_executor = None
+
+
+def init_runner(app):
+    """
+    Bind the runner to the Flask app
+    Safe to call more than once (scripts build several apps)
+    """
+    global _app, _executor
+
+    _app = app
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=app.config['JOB_RUNNER_WORKERS'],
+            thread_name_prefix='job-runner'
+        )
+
+
+def get_app():
+    if _app is None:
+        raise RuntimeError("Job runner not initialised - call init_runner(app) first")
+    return _app
+
+
+def run_in_app_context(func, *args, **kwargs):
+    """Run `func` inside its own app context and session"""
+    with get_app().app_context():
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            db.session.rollback()
+            logger.error(f"Background job {func.__name__} failed", exc_info=True)
+            raise
+        finally:
+            db.session.remove()
+
+
+def app_context_job(func):
+    """
+    Decorator for functions run by APScheduler
+    functools.wraps keeps the module/qualname, so the persistent job store
+    still references the job by its plain import path.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_in_app_context(func, *args, **kwargs)
+    return wrapper
+
+
+def submit(func, *args, **kwargs):
+    """Run `func` on the bounded runner pool; returns a Future"""
+    if _executor is None:
+        raise RuntimeError("Job runner not initialised - call init_runner(app) first")
+    return _executor.submit(run_in_app_context, func, *args, **kwargs)
+
+
+def shutdown_runner(wait=True):
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -1,117 +1,285 @@
 """
 Task scheduler for background jobs
-Handles weekly ATP rankings updates with retry logic
+Handles weekly rankings updates (all sources): a publish window opens each
+week and sources are probed on a backoff schedule until new data appears
 """
 
+import time
 import logging
 from datetime import datetime, timedelta
 from utils.logging_config import log_job_execution
+from flask import current_app
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 
-from tasks.scrapers.atp_scraper import scrape_and_update_rankings
+from tasks.ingest import scrape_and_update_rankings, scrape_and_update_tours, SCRAPE_LOCK_NAME
+from tasks.freshness import pending_tours, probe_for_new_data, probe_delay_minutes, window_is_open
+from tasks.scrapers.profile_enricher import enrich_player_profiles
+from tasks.cache_warming import warm_and_publish
+from tasks.maintenance import prune_expired_tokens_job
+from tasks.leader_lock import LeaderElector, WORKER_ID, get_lock, acquire_exclusive, release
+from tasks.runner import app_context_job
+from models import db
 
 # Configure logging
 logger = logging.getLogger('scraping')
 
+SCHEDULER_LOCK_NAME = 'scheduler'
+
+# Running scheduler (leader process only) and this process's elector
 scheduler = None
+elector = None
 
-def weekly_rankings_job():
-    """Weekly job with detailed logging"""
-    logger.info("🕒 SCHEDULED JOB TRIGGERED: Weekly Rankings Update")
-    
-    success = scrape_and_update_rankings()
-    
-    if not success:
-        logger.warning("⚠️  Initial attempt failed - scheduling retry in 24 hours")
-        schedule_retry()
-        log_job_execution("Weekly ATP Update", False, "Scheduled retry in 24h")
+@app_context_job
+def publish_window_job():
+    """Weekly job: the publish window opens, start probing the sources"""
+    logger.info("🕒 SCHEDULED JOB TRIGGERED: Rankings publish window opened")
+    schedule_probe(attempt=0, delay_minutes=0)
+
+@app_context_job
+def publish_probe_job(attempt=0):
+    """
+    Probe every source that hasn't published new rankings this window and
+    run the full update only for the ones that have. Reschedules itself on
+    exponential backoff until every source is fresh or the window closes.
+    """
+    config = current_app.config
+    pending = pending_tours(config)
+
+    if not pending:
+        logger.info("✅ All sources are up to date for this week")
+        return
+
+    if not window_is_open(config):
+        logger.error(f"❌ No new rankings for {pending} before the window closed - MANUAL INTERVENTION REQUIRED")
+        log_job_execution("Rankings Publish Check", False, f"CRITICAL: {pending} not updated this week")
+        return
+
+    logger.info(f"🔎 PROBE #{attempt + 1}: checking {', '.join(pending)} for new rankings")
+
+    # Full scrape only where the probe saw new data or couldn't tell cheaply
+    to_update = [tour for tour in pending if probe_for_new_data(tour, config) is not False]
+    if to_update:
+        owner = acquire_exclusive(SCRAPE_LOCK_NAME, config['SCRAPE_LOCK_TTL_SECONDS'])
+        if owner:
+            try:
+                scrape_and_update_tours(to_update, only_if_changed=True)
+            finally:
+                release(SCRAPE_LOCK_NAME, owner)
+        else:
+            # A manual update is scraping; the next probe sees what it ingested
+            logger.info("⏸️ A manual update is running - skipping this probe's scrape")
+
+    still_pending = pending_tours(config)
+    updated = [tour for tour in pending if tour not in still_pending]
+
+    if updated:
+        log_job_execution("Weekly Rankings Update", True, f"New rankings ingested for {updated}")
+    if 'atp' in updated:
+        run_profile_enrichment()
+
+    if still_pending:
+        delay = probe_delay_minutes(config, attempt)
+        reschedule_probe(attempt + 1, delay)
+        logger.info(f"⏳ Still waiting on {still_pending} - next probe in {delay} minutes")
     else:
         logger.info("✅ Weekly rankings update completed successfully")
-        log_job_execution("Weekly ATP Update", True, "All systems normal")
 
-def schedule_retry():
+def schedule_probe(attempt, delay_minutes):
     """
-    Schedule a retry attempt 24 hours later if the main job fails
+    Schedule the next publish probe (a single pending probe job at a time)
     """
-    retry_time = datetime.now() + timedelta(hours=24)
+    run_time = datetime.now() + timedelta(minutes=delay_minutes)
     
     scheduler.add_job(
-        func=retry_rankings_job,
-        trigger=DateTrigger(run_date=retry_time),
-        id='rankings_retry',
-        replace_existing=True  # Replace any existing retry job
+        func=publish_probe_job,
+        trigger=DateTrigger(run_date=run_time),
+        kwargs={'attempt': attempt},
+        id='publish_probe',
+        replace_existing=True  # Replace any existing probe job
     )
     
-    logger.info(f"Retry job scheduled for {retry_time}")
+    logger.info(f"Publish probe scheduled for {run_time}")
 
-def retry_rankings_job():
-    """Retry job with logging"""
-    logger.info("🔄 RETRY JOB TRIGGERED: Second attempt at rankings update")
-    
-    success = scrape_and_update_rankings()
+def reschedule_probe(attempt, delay_minutes, tries=3):
+    """
+    schedule_probe from inside a probe job
+    A failed write here would end this week's backoff chain, so end our own
+    transaction first and retry a few times before giving up.
+    """
+    for attempt_number in range(1, tries + 1):
+        try:
+            db.session.commit()
+            schedule_probe(attempt, delay_minutes)
+            return
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"⚠️ Could not schedule the next probe (try {attempt_number}/{tries}): {str(e)}")
+            time.sleep(attempt_number * 5)
+    logger.error("❌ Publish probe chain stopped - MANUAL INTERVENTION REQUIRED")
+    log_job_execution("Rankings Publish Check", False, "CRITICAL: next probe could not be scheduled")
+
+def run_profile_enrichment():
+    """
+    Fetch profiles for new or stale players after a successful update
+    Failures are logged only - rankings are already up to date
+    """
+    try:
+        count = enrich_player_profiles()
+        if count:
+            # Cached pages embed profiles - rebuild them with the new details
+            warm_and_publish(['atp'])
+        log_job_execution("Profile Enrichment", True, f"{count} profiles updated")
+    except Exception as e:
+        logger.error(f"Profile enrichment failed: {str(e)}", exc_info=True)
+        log_job_execution("Profile Enrichment", False, str(e))
+
+def start_scheduler(app=None):
+    """
+    Start leader election for this process
+    Only the process holding the DB lock runs the scheduler, so several
+    workers/containers never scrape at the same time. Jobs live in the
+    database, so pending retries survive restarts and leader changes.
+    """
+    global elector
     
-    if success:
-        logger.info("✅ Retry attempt successful")
-        log_job_execution("ATP Update Retry", True, "Recovered from initial failure")
-    else:
-        logger.error("❌ Retry attempt failed - MANUAL INTERVENTION REQUIRED")
-        log_job_execution("ATP Update Retry", False, "CRITICAL: Both attempts failed")
+    if elector is not None:
+        logger.warning("Scheduler already running - skipping initialization")
+        return elector
+
+    app = app or current_app._get_current_object()
 
-def start_scheduler():
-    """Start scheduler with logging"""
+    elector = LeaderElector(
+        app,
+        name=SCHEDULER_LOCK_NAME,
+        ttl_seconds=app.config['SCHEDULER_LOCK_TTL_SECONDS'],
+        on_elected=lambda: start_leader_scheduler(app),
+        on_demoted=stop_leader_scheduler
+    )
+    elector.start()
+    logger.info(f"📅 SCHEDULER ELECTION STARTED for {WORKER_ID}")
+
+    return elector
+
+def start_leader_scheduler(app):
+    """Start the job scheduler once this process becomes leader"""
     global scheduler
-    
+
     if scheduler is not None:
-        logger.warning("Scheduler already running - skipping initialization")
         return scheduler
+
+    scheduler = BackgroundScheduler(
+        jobstores={
+            'default': SQLAlchemyJobStore(
+                engine=db.engine,
+                tablename='apscheduler_jobs'
+            )
+        },
+        # Bounded pool; each job pushes its own app context (see tasks/runner.py)
+        executors={
+            'default': ThreadPoolExecutor(app.config['JOB_RUNNER_WORKERS'])
+        },
+        job_defaults={
+            # A job missed during a deploy or leader handover still runs once
+            'coalesce': True,
+            'misfire_grace_time': app.config['SCHEDULER_MISFIRE_GRACE_SECONDS']
+        }
+    )
     
-    scheduler = BackgroundScheduler()
-    
-    # Schedule weekly job
+    # Open the publish window weekly (replace_existing keeps one copy in the job store)
     scheduler.add_job(
-        func=weekly_rankings_job,
+        func=publish_window_job,
         trigger=CronTrigger(
-            day_of_week='mon',
-            hour=23,
+            day_of_week=app.config['PUBLISH_WINDOW_DAY'],
+            hour=app.config['PUBLISH_WINDOW_START_HOUR'],
             minute=0,
             timezone='GMT'
         ),
-        id='weekly_rankings',
-        name='Weekly ATP Rankings Update'
+        id='publish_window',
+        name='Weekly Rankings Publish Window',
+        replace_existing=True
+    )
+    
+    # Daily clean-up of expired auth tokens
+    scheduler.add_job(
+        func=prune_expired_tokens_job,
+        trigger=CronTrigger(hour=4, minute=0, timezone='GMT'),
+        id='prune_tokens',
+        name='Prune Expired Tokens',
+        replace_existing=True
     )
     
     # Infinite Loop is hidden here
     scheduler.start()
-    logger.info("📅 SCHEDULER STARTED: ATP rankings job scheduled for Mondays 11 PM GMT")
+
+    # Jobs from the fixed Monday 23:00 schedule may still be in the job store
+    for legacy_job_id in ('weekly_rankings', 'rankings_retry'):
+        if scheduler.get_job(legacy_job_id):
+            scheduler.remove_job(legacy_job_id)
+
+    # Leader started mid-window (deploy / failover): resume probing
+    if window_is_open(app.config) and not scheduler.get_job('publish_probe'):
+        schedule_probe(attempt=0, delay_minutes=0)
+
+    logger.info(
+        f"📅 SCHEDULER STARTED: publish window opens "
+        f"{app.config['PUBLISH_WINDOW_DAY'].title()} {app.config['PUBLISH_WINDOW_START_HOUR']}:00 GMT"
+    )
     
     return scheduler
 
+def stop_leader_scheduler():
+    """Stop running jobs here; they stay in the job store for the next leader"""
+    global scheduler
+
+    if scheduler is not None:
+        scheduler.shutdown(wait=False)
+        scheduler = None
+        logger.info("Scheduler stopped (leadership released)")
+
 
 def stop_scheduler():
     """
-    Stop the background scheduler
+    Stop the background scheduler and release leadership
     """
-    global scheduler
+    global elector
     
-    if scheduler is not None:
-        scheduler.shutdown()
-        scheduler = None
+    if elector is not None:
+        elector.stop()
+        elector = None
         logger.info("Scheduler stopped")
 
 def get_scheduled_jobs():
     """
     Get list of currently scheduled jobs (useful for debugging)
+    Only the leader has a running scheduler
     """
     if scheduler is not None:
         return scheduler.get_jobs()
     return []
 
+def get_scheduler_status():
+    """Leadership info for this process and the cluster"""
+    return {
+        'worker_id': WORKER_ID,
+        'is_leader': bool(elector and elector.is_leader),
+        'lock': get_lock(SCHEDULER_LOCK_NAME)
+    }
+
 # Manual trigger function for testing
 def trigger_manual_update():
     """
     Manually trigger rankings update (useful for testing)
     """
     logger.info("Manual rankings update triggered")
-    return scrape_and_update_rankings()
\ No newline at end of file
+    owner = acquire_exclusive(SCRAPE_LOCK_NAME, current_app.config['SCRAPE_LOCK_TTL_SECONDS'])
+    if not owner:
+        logger.warning("⚠️ A rankings update is already running - skipping")
+        return False
+    try:
+        return scrape_and_update_rankings()
+    finally:
+        release(SCRAPE_LOCK_NAME, owner)
\ No newline at end of file
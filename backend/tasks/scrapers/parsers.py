@@ -0,0 +1,252 @@
+"""
+Parse strategies for the ATP rankings page
+Each strategy pairs a cheap structural fingerprint with a parser for one layout.
+The last strategy that produced data is remembered on disk and tried first.
+"""
+
+import os
+import re
+import json
+import logging
+from datetime import datetime, timezone
+from bs4 import BeautifulSoup, SoupStrainer
+
+from config import Config
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+# name -> {'fingerprint': compiled regex, 'parse': function}
+# Registration order is the fallback order when nothing has been remembered yet
+PARSE_STRATEGIES = {}
+
+
+def parse_strategy(name, fingerprint):
+    """
+    Register a parse function under `name`
+    `fingerprint` is a regex that must appear in the raw HTML for the layout
+    to be considered. re.search stops at the first hit, so the check never
+    builds a DOM and rarely reads the whole document.
+    """
+    def decorator(func):
+        PARSE_STRATEGIES[name] = {
+            'fingerprint': re.compile(fingerprint, re.IGNORECASE),
+            'parse': func
+        }
+        return func
+    return decorator
+
+
+############################ STRATEGY STATE ############################
+def load_last_strategy():
+    """Return the name of the last successful strategy, or None"""
+    try:
+        with open(Config.PARSER_STATE_FILE, 'r', encoding='utf-8') as f:
+            name = json.load(f).get('last_strategy')
+        return name if name in PARSE_STRATEGIES else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_last_strategy(name):
+    """Persist the successful strategy so the next run tries it first"""
+    try:
+        directory = os.path.dirname(Config.PARSER_STATE_FILE)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with open(Config.PARSER_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_strategy': name,
+                'updated_at': datetime.now(timezone.utc).isoformat()
+            }, f)
+    except OSError as e:
+        # Losing the hint only costs a slower parse next time
+        logger.warning(f"Could not persist parser state: {str(e)}")
+
+
+def candidate_strategies(html_content, last_strategy=None):
+    """
+    Order strategies for this document:
+    remembered strategy first, then the rest, keeping only those whose
+    fingerprint is present in the HTML
+    """
+    names = list(PARSE_STRATEGIES)
+    if last_strategy:
+        names.remove(last_strategy)
+        names.insert(0, last_strategy)
+
+    return [
+        name for name in names
+        if PARSE_STRATEGIES[name]['fingerprint'].search(html_content)
+    ]
+
+
+def parse_with_strategies(html_content):
+    """
+    Parse the page with the first strategy that yields players
+    Returns (players_data, strategy_name). strategy_name is None if nothing matched.
+    """
+    last_strategy = load_last_strategy()
+    candidates = candidate_strategies(html_content, last_strategy)
+
+    if not candidates:
+        # Unknown layout: fall back to trying every parser on the full document
+        logger.warning("No parser fingerprint matched - trying all strategies")
+        candidates = list(PARSE_STRATEGIES)
+
+    for name in candidates:
+        players_data = PARSE_STRATEGIES[name]['parse'](html_content)
+        if players_data:
+            logger.info(f"Parsed {len(players_data)} rows with '{name}' strategy")
+            if name != last_strategy:
+                save_last_strategy(name)
+            return players_data, name
+
+        logger.info(f"'{name}' strategy found no rows")
+
+    return [], None
+
+
+############################ STRATEGIES ############################
+PROFILE_LINK_RE = re.compile(r'/players/([^/]+)/([^/]+)/overview')
+
+
+def parse_points(text):
+    """'12,030' -> 12030"""
+    return int(text.replace(',', '').replace('.', ''))
+
+
+def parse_profile_link(element):
+    """
+    Extract (slug, atp_id) from the first profile link inside `element`
+    '/en/players/jannik-sinner/s0ag/overview' -> ('jannik-sinner', 's0ag')
+    """
+    link = element.find('a', href=PROFILE_LINK_RE)
+    if not link:
+        return None, None
+    match = PROFILE_LINK_RE.search(link['href'])
+    return match.group(1), match.group(2)
+
+
+# Ranking
+# <td class="rank bold heavy tiny-cell" colspan="2">1</td>
+# Name
+# <li class="name"><a href="/en/players/jannik-sinner/s0ag/overview">
+#     <span class="lastName">J. Sinner</span></a></li>
+# Points
+# <td class="points center bold extrabold small-cell" colspan="3">12,030</td>
+@parse_strategy('table', r'<td[^>]+class="[^"]*\brank\b')
+def parse_table_structure(html_content):
+    """
+    Parse table-based ranking structure
+    Only <tr> elements are built into the tree
+    """
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=SoupStrainer('tr'))
+    players_data = []
+
+    name_selectors = [
+        'li.name span.lastName',
+        'td .player-name',
+        'td .name',
+        '.lastName'
+    ]
+    points_selectors = [
+        'td.points',
+        'td .points',
+        '.points'
+    ]
+
+    for row in soup.find_all('tr'):
+        try:
+            # Look for rank
+            rank_cell = row.find('td', class_=lambda x: x and 'rank' in x.lower())
+            if not rank_cell:
+                continue
+
+            rank_text = rank_cell.get_text(strip=True)
+            if not rank_text.isdigit():
+                continue
+            rank = int(rank_text)
+
+            # Look for name - try multiple selectors
+            name = None
+            for selector in name_selectors:
+                name_element = row.select_one(selector)
+                if name_element:
+                    name = name_element.get_text(strip=True)
+                    break
+
+            if not name:
+                continue
+
+            # Look for points
+            points = None
+            for selector in points_selectors:
+                points_element = row.select_one(selector)
+                if points_element:
+                    points = parse_points(points_element.get_text(strip=True))
+                    break
+
+            if points is None:
+                continue
+
+            slug, atp_id = parse_profile_link(row)
+
+            players_data.append({
+                'rank': rank,
+                'name': name,
+                'points': points,
+                'atp_id': atp_id,
+                'slug': slug
+            })
+            logger.debug(f"Parsed: #{rank} {name} - {points:,} points")
+
+        except (ValueError, AttributeError):
+            continue
+
+    return players_data
+
+
+@parse_strategy('div', r'<div[^>]+class="[^"]*player')
+def parse_div_structure(html_content):
+    """
+    Parse div-based ranking structure
+    Only player <div> elements are built into the tree
+    """
+    strainer = SoupStrainer('div', class_=lambda x: x and 'player' in x.lower())
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=strainer)
+    players_data = []
+
+    for div in soup.find_all('div', class_=lambda x: x and 'player' in x.lower()):
+        try:
+            # Look for rank, name, and points within the div
+            rank_element = div.find(class_=lambda x: x and 'rank' in x.lower())
+            name_element = div.find(class_=lambda x: x and 'name' in x.lower())
+            points_element = div.find(class_=lambda x: x and 'point' in x.lower())
+
+            if not all([rank_element, name_element, points_element]):
+                continue
+
+            rank_text = rank_element.get_text(strip=True)
+            if not rank_text.isdigit():
+                continue
+            rank = int(rank_text)
+
+            name = name_element.get_text(strip=True)
+            points = parse_points(points_element.get_text(strip=True))
+            slug, atp_id = parse_profile_link(div)
+
+            players_data.append({
+                'rank': rank,
+                'name': name,
+                'points': points,
+                'atp_id': atp_id,
+                'slug': slug
+            })
+            logger.debug(f"Parsed: #{rank} {name} - {points:,} points")
+
+        except (ValueError, AttributeError):
+            continue
+
+    return players_data
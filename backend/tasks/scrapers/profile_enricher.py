@@ -0,0 +1,211 @@
+"""
+ATP player profile enrichment
+Fetches country, age, height and handedness for players that have no
+profile yet or whose profile is older than PROFILE_STALE_DAYS.
+
+atptour.com sits behind Cloudflare, so pages are loaded the same way as the
+rankings page: headless Chrome (tasks/scrapers/atp_scraper.py). Each pool
+worker keeps one browser for the whole run, so the challenge is only
+solved once per worker.
+"""
+
+import re
+import time
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from config import Config
+from models import Player, PlayerProfile, db
+from tasks.scrapers.atp_scraper import create_chrome_driver, load_page
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+PROFILE_URL = 'https://www.atptour.com/en/players/{slug}/{atp_id}/overview'
+# Present once the profile has rendered (absent on the Cloudflare page)
+PROFILE_READY_MARKER = 'personal_details'
+
+
+class HostThrottle:
+    """
+    Per-host rate limiting shared by all worker threads
+    Each host gets at most one request every `min_interval` seconds.
+    """
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BrowserPool:
+    """One headless Chrome per worker thread, created on first use"""
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.drivers = []
+
+    def driver(self):
+        if getattr(self.local, 'driver', None) is None:
+            self.local.driver = create_chrome_driver()
+            with self.lock:
+                self.drivers.append(self.local.driver)
+        return self.local.driver
+
+    def close(self):
+        with self.lock:
+            for driver in self.drivers:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logger.warning(f"Closing browser failed: {str(e)}")
+            self.drivers = []
+
+
+def enrich_player_profiles():
+    """
+    Fetch profiles for new or stale players
+    Network work runs on a bounded pool; database writes stay on this thread
+    Returns the number of profiles written
+    """
+    players = players_needing_profiles()
+    if not players:
+        logger.info("Profile enrichment: all profiles are fresh")
+        return 0
+
+    logger.info(f"Profile enrichment: {len(players)} players to fetch")
+    start_time = datetime.now()
+
+    throttle = HostThrottle(Config.PROFILE_MIN_INTERVAL_SECONDS)
+    browsers = BrowserPool()
+
+    results = {}
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=Config.PROFILE_WORKERS) as executor:
+            futures = {
+                executor.submit(fetch_profile, browsers, throttle, atp_id, slug): atp_id
+                for atp_id, slug in players
+            }
+            for future in as_completed(futures):
+                atp_id = futures[future]
+                try:
+                    results[atp_id] = future.result()
+                except Exception as e:
+                    failures += 1
+                    logger.warning(f"Profile fetch failed for {atp_id}: {str(e)}")
+    finally:
+        browsers.close()
+
+    save_profiles(results)
+
+    execution_time = (datetime.now() - start_time).total_seconds()
+    logger.info(
+        f"Profile enrichment finished in {execution_time:.1f}s: "
+        f"{len(results)} saved, {failures} failed"
+    )
+    return len(results)
+
+
+def players_needing_profiles():
+    """Return (atp_id, slug) pairs with no profile or a stale one"""
+    stale_before = datetime.now(timezone.utc) - timedelta(days=Config.PROFILE_STALE_DAYS)
+
+    rows = (
+        db.session.query(Player.tour_player_id, Player.slug)
+        .outerjoin(PlayerProfile, PlayerProfile.atp_id == Player.tour_player_id)
+        .filter(Player.tour == 'atp')
+        .filter(Player.tour_player_id.isnot(None), Player.slug.isnot(None))
+        .filter(db.or_(
+            PlayerProfile.id.is_(None),
+            PlayerProfile.fetched_at < stale_before.replace(tzinfo=None)
+        ))
+        .all()
+    )
+    return [(row.tour_player_id, row.slug) for row in rows]
+
+
+def fetch_profile(browsers, throttle, atp_id, slug):
+    """Fetch and parse one profile page (runs on a worker thread)"""
+    url = PROFILE_URL.format(slug=slug, atp_id=atp_id)
+    throttle.wait(url)
+    html_content = load_page(browsers.driver(), url, PROFILE_READY_MARKER, Config.PROFILE_PAGE_TIMEOUT_SECONDS)
+    return parse_profile_html(html_content)
+
+
+def parse_profile_html(html_content):
+    """
+    Parse the personal details block of a profile page
+    <div class="personal_details"> ... <li><span>Age</span><span>23 (2001/08/16)</span></li>
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    container = soup.find(class_='personal_details') or soup
+
+    details = {}
+    for item in container.find_all('li'):
+        spans = item.find_all('span', recursive=False)
+        if len(spans) < 2:
+            continue
+        label = spans[0].get_text(strip=True).lower()
+        details[label] = spans[1].get_text(' ', strip=True)
+
+    profile = {
+        'country': details.get('country') or None,
+        'birth_date': None,
+        'height_cm': None,
+        'plays': details.get('plays') or None
+    }
+
+    birth_match = re.search(r'(\d{4})/(\d{2})/(\d{2})', details.get('age', ''))
+    if birth_match:
+        year, month, day = (int(part) for part in birth_match.groups())
+        profile['birth_date'] = datetime(year, month, day).date()
+
+    height_match = re.search(r'(\d{3})\s*cm', details.get('height', ''))
+    if height_match:
+        profile['height_cm'] = int(height_match.group(1))
+
+    return profile
+
+
+def save_profiles(results):
+    """Upsert parsed profiles keyed by atp_id"""
+    if not results:
+        return
+
+    try:
+        existing = {
+            profile.atp_id: profile
+            for profile in PlayerProfile.query.filter(
+                PlayerProfile.atp_id.in_(list(results))
+            )
+        }
+
+        now = datetime.now(timezone.utc)
+        for atp_id, data in results.items():
+            profile = existing.get(atp_id) or PlayerProfile(atp_id=atp_id)
+            profile.country = data['country']
+            profile.birth_date = data['birth_date']
+            profile.height_cm = data['height_cm']
+            profile.plays = data['plays']
+            profile.fetched_at = now
+            db.session.add(profile)
+
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Saving profiles failed: {str(e)}")
+        raise
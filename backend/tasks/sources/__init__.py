@@ -0,0 +1,14 @@
+"""
+Ranking source registry
+Add a RankingSource subclass here to have it scheduled and served by ?tour=
+"""
+
+from tasks.sources.atp import ATPSource
+from tasks.sources.wta import WTASource
+
+SOURCES = {
+    source.tour: source
+    for source in (ATPSource(), WTASource())
+}
+
+DEFAULT_TOUR = 'atp'
@@ -0,0 +1,23 @@
+"""
+ATP singles rankings source
+Wraps the Selenium scraper in tasks/scrapers/atp_scraper.py
+"""
+
+from tasks.sources.base import RankingSource
+from tasks.scrapers.atp_scraper import fetch_atp_rankings_html, parse_rankings_html
+
+
+class ATPSource(RankingSource):
+    tour = 'atp'
+    name = 'ATP Singles'
+    fixture_path = 'scripts/rankings_html/atp_rankings_selenium.html'
+
+    def fetch(self):
+        return fetch_atp_rankings_html()
+
+    def parse(self, raw):
+        return parse_rankings_html(raw)
+
+    def identity(self, row):
+        # /en/players/<slug>/<atp_id>/overview
+        return row.get('atp_id'), row.get('slug')
@@ -0,0 +1,142 @@
+"""
+Base class for ranking sources
+A source knows how to fetch one tour's rankings, parse the raw payload
+and map each row onto a stable player identity.
+"""
+
+import os
+import logging
+
+import requests
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+
+class RankingSource:
+    # Short identifier stored on Player.tour and used by ?tour= filters
+    tour = None
+    # Human readable name for logs
+    name = None
+    # Saved raw page/payload used for offline parsing
+    fixture_path = None
+    # Other saved payload shapes the parser must read the same way
+    fixture_variants = ()
+    # Only keep ranks 1..max_rank
+    max_rank = 100
+    # Cheap freshness probe: a small request returning the top of the rankings
+    # None means the source can only be checked with a full fetch
+    probe_url = None
+    probe_params = None
+    user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    def fetch(self):
+        """Download the raw rankings payload (HTML or JSON text)"""
+        raise NotImplementedError
+
+    def parse(self, raw):
+        """
+        Parse a raw payload into row dicts
+        Each row has at least 'rank', 'name' and 'points'
+        """
+        raise NotImplementedError
+
+    def identity(self, row):
+        """
+        Return (tour_player_id, slug) for a parsed row
+        Either may be None when the source doesn't expose it
+        """
+        return row.get('tour_player_id'), row.get('slug')
+
+    def probe(self, etag=None, last_modified=None):
+        """
+        Conditional request against probe_url
+        Returns None if the source has no cheap probe, otherwise a dict:
+        {'not_modified': bool, 'raw': text or None, 'etag': ..., 'last_modified': ...}
+        Raises requests exceptions on network errors.
+        """
+        if not self.probe_url:
+            return None
+
+        headers = {'User-Agent': self.user_agent}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = requests.get(
+            self.probe_url,
+            params=self.probe_params,
+            headers=headers,
+            timeout=15
+        )
+        if response.status_code == 304:
+            return {'not_modified': True, 'raw': None, 'etag': etag, 'last_modified': last_modified}
+
+        response.raise_for_status()
+        return {
+            'not_modified': False,
+            'raw': response.text,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+
+    def ranking_date(self, raw):
+        """
+        Date of the ranking week in a probe payload, or None if the payload
+        doesn't say (the caller then falls back to a full fetch)
+        """
+        return None
+
+    def load_fixture(self, path=None):
+        """Read the saved payload (or a variant) for offline parsing"""
+        path = path or self.fixture_path
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError(f"No fixture for {self.tour}: {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def save_fixture(self, raw):
+        """Store a freshly fetched payload as the offline fixture"""
+        directory = os.path.dirname(self.fixture_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.fixture_path, 'w', encoding='utf-8') as f:
+            f.write(raw)
+        logger.info(f"[{self.tour}] Fixture saved to {self.fixture_path}")
+
+    def collect(self, offline=False):
+        """
+        Fetch (or load the fixture) and parse
+        Returns cleaned rows: unique ranks within 1..max_rank, with identity fields
+        """
+        raw = self.load_fixture() if offline else self.fetch()
+        if not raw:
+            return []
+
+        rows = self.clean(self.parse(raw))
+        logger.info(f"[{self.tour}] Parsed {len(rows)} unique players")
+        return rows
+
+    def clean(self, parsed_rows):
+        """Unique ranks within 1..max_rank, with identity fields mapped"""
+        rows = []
+        seen_ranks = set()
+        for row in parsed_rows:
+            rank = row['rank']
+            if rank in seen_ranks or not 1 <= rank <= self.max_rank:
+                continue
+            seen_ranks.add(rank)
+
+            tour_player_id, slug = self.identity(row)
+            rows.append({
+                'rank': rank,
+                'name': row['name'],
+                'points': row['points'],
+                'tour_player_id': tour_player_id,
+                'slug': slug
+            })
+        return rows
+
+    def __repr__(self):
+        return f"<RankingSource {self.tour}>"
@@ -0,0 +1,104 @@
+"""
+WTA singles rankings source
+The WTA site renders rankings from a public JSON API, so no browser is needed.
+"""
+
+import json
+import logging
+from datetime import date
+
+import requests
+
+from tasks.sources.base import RankingSource
+
+# Configure logging
+logger = logging.getLogger('scraping')
+
+WTA_RANKINGS_URL = 'https://api.wtatennis.com/tennis/players/ranked'
+WTA_QUERY = {
+    'page': 0,
+    'type': 'rankSingles',
+    'sort': 'asc',
+    'metric': 'SINGLES'
+}
+
+
+class WTASource(RankingSource):
+    tour = 'wta'
+    name = 'WTA Singles'
+    fixture_path = 'scripts/rankings_html/wta_rankings.json'
+    # Same entries wrapped the way paged deployments return them
+    fixture_variants = ('scripts/rankings_html/wta_rankings_paged.json',)
+    # The first page of the same feed is enough to spot a new week (by rankedAt)
+    probe_url = WTA_RANKINGS_URL
+    probe_params = dict(WTA_QUERY, pageSize=10)
+
+    def fetch(self):
+        params = dict(WTA_QUERY, pageSize=self.max_rank)
+        try:
+            logger.info(f"Fetching: {WTA_RANKINGS_URL}")
+            response = requests.get(
+                WTA_RANKINGS_URL,
+                params=params,
+                headers={'User-Agent': self.user_agent, 'Accept': 'application/json'},
+                timeout=30
+            )
+            response.raise_for_status()
+            return response.text
+        except requests.RequestException as e:
+            logger.error(f"Error fetching WTA rankings: {str(e)}")
+            return None
+
+    def parse(self, raw):
+        """
+        Payload is a list of ranking entries:
+        [{"ranking": 1, "points": 9000, "rankedAt": "2025-10-13T00:00:00.000Z",
+          "player": {"id": 320760, "fullName": "...", "firstName": "...", "lastName": "..."}}, ...]
+        Some deployments wrap the list in {"content": [...]}
+        """
+        try:
+            payload = load_entries(raw)
+        except ValueError:
+            logger.error("WTA payload is not valid JSON")
+            return []
+
+        rows = []
+        for entry in payload:
+            try:
+                player = entry.get('player') or {}
+                name = player.get('fullName') or " ".join(
+                    part for part in (player.get('firstName'), player.get('lastName')) if part
+                )
+                if not name:
+                    continue
+
+                rows.append({
+                    'rank': int(entry['ranking']),
+                    'name': name,
+                    'points': int(entry['points']),
+                    'wta_id': str(player['id']) if player.get('id') is not None else None
+                })
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+
+        return rows
+
+    def identity(self, row):
+        return row.get('wta_id'), None
+
+    def ranking_date(self, raw):
+        """Ranking week from the first entry's rankedAt"""
+        try:
+            entries = load_entries(raw)
+            ranked_at = entries[0].get('rankedAt') if entries else None
+            return date.fromisoformat(ranked_at[:10]) if ranked_at else None
+        except (ValueError, TypeError, AttributeError, KeyError):
+            return None
+
+
+def load_entries(raw):
+    """Ranking entries of a payload, unwrapping {"content": [...]}"""
+    payload = json.loads(raw)
+    if isinstance(payload, dict):
+        payload = payload.get('content') or payload.get('data') or []
+    return payload
@@ -0,0 +1,283 @@
+"""
+Shared cache backends
+Route-level caches go through one small interface (get / set / delete /
+incr / stats) so a single container can use process memory and a
+multi-node deployment can point every node at the same Redis server.
+
+- MemoryCache: bounded LRU with per-entry TTL, lives in this process
+- RedisCache: speaks the Redis protocol (RESP) over a plain socket, so any
+  Redis-compatible server works - including scripts/redis_standin.py locally
+
+Values must be JSON-serialisable (RedisCache stores them as JSON).
+"""
+
+import json
+import time
+import queue
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def hit_rate(hits, misses):
+    lookups = hits + misses
+    return round(hits / lookups, 3) if lookups else None
+
+
+class MemoryCache:
+    def __init__(self, max_entries=1024, default_ttl=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()    # key -> (expires_at or None, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expiry(self, ttl):
+        ttl = ttl if ttl is not None else self.default_ttl
+        return time.monotonic() + ttl if ttl else None
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.entries[key] = (self._expiry(ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def incr(self, key, amount=1, ttl=None):
+        """Add to a counter; `ttl` applies when the counter is created"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                entry = (self._expiry(ttl), 0)
+            value = entry[1] + amount
+            self.entries[key] = (entry[0], value)
+            self.entries.move_to_end(key)
+            return value
+
+    def stats(self):
+        return {
+            'backend': 'memory',
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': hit_rate(self.hits, self.misses),
+            'evictions': self.evictions
+        }
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisCache:
+    """
+    Minimal Redis client for caching
+    Connections are pooled (one per concurrent caller at most `pool_size`).
+    Server errors are logged and treated as misses: a cache outage makes
+    requests slower, never fail.
+    """
+    def __init__(self, url, default_ttl=None, prefix='', pool_size=8, timeout=2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.timeout = timeout
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    ############################ PROTOCOL ############################
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        conn = (sock, sock.makefile('rb'))
+        if self.password:
+            self._call(conn, 'AUTH', self.password)
+        if self.db:
+            self._call(conn, 'SELECT', self.db)
+        return conn
+
+    @staticmethod
+    def _encode(*args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    @classmethod
+    def _read_reply(cls, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RedisError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            if count < 0:
+                return None
+            return [cls._read_reply(reader) for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _call(self, conn, *args):
+        sock, reader = conn
+        sock.sendall(self._encode(*args))
+        return self._read_reply(reader)
+
+    def execute(self, *args):
+        """Run one command on a pooled connection"""
+        try:
+            conn = self.pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            result = self._call(conn, *args)
+        except (OSError, ConnectionError):
+            conn[0].close()
+            raise
+
+        try:
+            self.pool.put_nowait(conn)
+        except queue.Full:
+            conn[0].close()
+        return result
+
+    def _safe(self, default, *args):
+        try:
+            return self.execute(*args)
+        except (OSError, ConnectionError, RedisError) as e:
+            self.errors += 1
+            logger.warning(f"Cache command {args[0]} failed: {str(e)}")
+            return default
+
+    ############################ CACHE API ############################
+    def _ttl(self, ttl):
+        return ttl if ttl is not None else self.default_ttl
+
+    def get(self, key, default=None):
+        raw = self._safe(None, 'GET', self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        args = ['SET', self.prefix + key, json.dumps(value)]
+        ttl = self._ttl(ttl)
+        if ttl:
+            args += ['PX', int(ttl * 1000)]
+        self._safe(None, *args)
+
+    def delete(self, key):
+        self._safe(None, 'DEL', self.prefix + key)
+
+    def incr(self, key, amount=1, ttl=None):
+        """Add to a counter; `ttl` applies when the counter is created"""
+        value = self._safe(None, 'INCRBY', self.prefix + key, amount)
+        if value is None:
+            return None
+        ttl = self._ttl(ttl)
+        if value == amount and ttl:
+            self._safe(None, 'PEXPIRE', self.prefix + key, int(ttl * 1000))
+        return value
+
+    def stats(self):
+        stats = {
+            'backend': 'redis',
+            'server': f"{self.host}:{self.port}/{self.db}",
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': hit_rate(self.hits, self.misses),
+            'errors': self.errors,
+            'evictions': None,
+            'entries': None
+        }
+        info = self._safe(None, 'INFO')
+        if info is not None:
+            for line in info.decode().splitlines():
+                name, _, value = line.partition(':')
+                if name == 'evicted_keys':
+                    stats['evictions'] = int(value)
+        size = self._safe(None, 'DBSIZE')
+        if size is not None:
+            stats['entries'] = size
+        return stats
+
+
+############################ CONFIGURED CACHE ############################
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def create_cache(config=Config):
+    """Build the backend selected by CACHE_BACKEND ('memory' or 'redis')"""
+    backend = getattr(config, 'CACHE_BACKEND', 'memory')
+    if backend == 'redis':
+        if not config.CACHE_URL:
+            raise ValueError("CACHE_BACKEND=redis needs CACHE_URL (redis://host:port/db)")
+        return RedisCache(
+            config.CACHE_URL,
+            default_ttl=config.CACHE_DEFAULT_TTL_SECONDS,
+            prefix=config.CACHE_KEY_PREFIX
+        )
+    if backend == 'memory':
+        return MemoryCache(
+            max_entries=config.CACHE_MAX_ENTRIES,
+            default_ttl=config.CACHE_DEFAULT_TTL_SECONDS
+        )
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+def get_cache():
+    """Cache shared by the routes of this process (and other nodes, for Redis)"""
+    global _shared
+
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = create_cache()
+                logger.info(f"Cache backend: {_shared.stats()['backend']}")
+    return _shared
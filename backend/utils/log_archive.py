@@ -0,0 +1,231 @@
+"""
+Compressed archive of rotated log segments
+On rollover the newest segment stays next to the log as app.log.1 (live
+followers drain it through their open handle); the segment it replaces
+is compressed into LOG_ARCHIVE_DIR instead of being deleted.
+
+An archive is a series of gzip members, one per LOG_ARCHIVE_BLOCK_KB of
+log text cut at line ends, so the file still works with zcat but each
+block can also be decompressed on its own. A JSON sidecar (.idx) lists
+every block's first timestamp and byte range, so reading a time range
+only decompresses the blocks that overlap it.
+
+Archives are removed oldest first once they are older than
+LOG_ARCHIVE_MAX_DAYS or take more than LOG_ARCHIVE_MAX_MB in total.
+"""
+
+import os
+import gzip
+import json
+import time
+import logging
+from logging.handlers import RotatingFileHandler
+
+from config import Config
+from utils.log_reader import TIMESTAMP_RE
+
+logger = logging.getLogger('scraping')
+
+
+def first_timestamp(data):
+    """asctime of the first timestamped line in a block of log bytes"""
+    for line in data.split(b'\n'):
+        match = TIMESTAMP_RE.match(line)
+        if match:
+            return match.group(1).decode()
+    return None
+
+
+def last_timestamp(data):
+    for line in reversed(data.split(b'\n')):
+        match = TIMESTAMP_RE.match(line)
+        if match:
+            return match.group(1).decode()
+    return None
+
+
+def index_path(archive_path):
+    return archive_path + '.idx'
+
+
+def archive_name(log_name, first, archive_dir):
+    """app.log.20261019-174236.gz (first record's time), made unique"""
+    stamp = first.replace('-', '').replace(':', '').replace(' ', '-') if first else time.strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(archive_dir, f"{log_name}.{stamp}.gz")
+    suffix = 1
+    while os.path.exists(path):
+        path = os.path.join(archive_dir, f"{log_name}.{stamp}-{suffix}.gz")
+        suffix += 1
+    return path
+
+
+def archive_segment(source, archive_dir, block_size):
+    """Compress a rotated log file block by block; returns the archive path"""
+    if not os.path.exists(archive_dir):
+        os.makedirs(archive_dir)
+
+    blocks = []
+    raw_offset = 0
+    offset = 0
+    tmp_path = os.path.join(archive_dir, os.path.basename(source) + '.tmp')
+
+    with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+        carry = b''
+        while True:
+            chunk = src.read(block_size)
+            data = carry + chunk
+            if not data:
+                break
+            if chunk:
+                # Cut at the last line end so records never span blocks
+                end = data.rfind(b'\n') + 1
+                if end == 0:
+                    carry = data
+                    continue
+                data, carry = data[:end], data[end:]
+            else:
+                carry = b''
+
+            compressed = gzip.compress(data)
+            dst.write(compressed)
+            blocks.append({
+                'first': first_timestamp(data),
+                'raw_offset': raw_offset,
+                'offset': offset,
+                'length': len(compressed)
+            })
+            raw_offset += len(data)
+            offset += len(compressed)
+            if not chunk:
+                break
+
+        last = None
+        if blocks:
+            src.seek(max(0, raw_offset - block_size))
+            last = last_timestamp(src.read())
+
+    first = next((block['first'] for block in blocks if block['first']), None)
+    archive_path = archive_name(os.path.basename(source).rsplit('.', 1)[0], first, archive_dir)
+    os.replace(tmp_path, archive_path)
+
+    index = {
+        'log': os.path.basename(source).rsplit('.', 1)[0],
+        'first': first,
+        'last': last,
+        'raw_size': raw_offset,
+        'size': offset,
+        'blocks': blocks
+    }
+    with open(index_path(archive_path) + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(index_path(archive_path) + '.tmp', index_path(archive_path))
+    return archive_path
+
+
+def load_index(archive_path):
+    try:
+        with open(index_path(archive_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_archives(archive_dir, log_name=None):
+    """[(archive path, index), ...] oldest first, optionally for one log (e.g. 'app.log')"""
+    if not os.path.isdir(archive_dir):
+        return []
+    archives = []
+    for filename in os.listdir(archive_dir):
+        if not filename.endswith('.gz'):
+            continue
+        archive_path = os.path.join(archive_dir, filename)
+        index = load_index(archive_path)
+        if index is None or (log_name and index['log'] != log_name):
+            continue
+        archives.append((archive_path, index))
+    archives.sort(key=lambda archive: (archive[1]['first'] or '', archive[0]))
+    return archives
+
+
+def read_blocks(archive_path, index, since=None, until=None):
+    """
+    Log lines (bytes) of the blocks that can hold records in [since, until]
+    A block ends where the next one starts, so only blocks starting after
+    `until` or followed by one starting before `since` are skipped.
+    """
+    blocks = index['blocks']
+    with open(archive_path, 'rb') as f:
+        for position, block in enumerate(blocks):
+            if until and block['first'] and block['first'] > until:
+                break
+            following = blocks[position + 1]['first'] if position + 1 < len(blocks) else None
+            if since and following and following < since:
+                continue
+            f.seek(block['offset'])
+            data = gzip.decompress(f.read(block['length']))
+            yield from data.splitlines(keepends=True)
+
+
+def enforce_retention(archive_dir, max_bytes, max_days):
+    """Delete archives past the age limit, then the oldest until under the size limit"""
+    if not os.path.isdir(archive_dir):
+        return
+    archives = []
+    for filename in os.listdir(archive_dir):
+        if filename.endswith('.gz'):
+            path = os.path.join(archive_dir, filename)
+            stats = os.stat(path)
+            archives.append((stats.st_mtime, stats.st_size, path))
+    archives.sort()
+
+    cutoff = time.time() - max_days * 86400
+    total = sum(size for _, size, _ in archives)
+    for mtime, size, path in archives:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        for stale in (path, index_path(path)):
+            if os.path.exists(stale):
+                os.remove(stale)
+        total -= size
+        logger.info(f"🗑️ Removed log archive {os.path.basename(path)}")
+
+
+class ArchivingRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that keeps one plain backup (.1) and archives older
+    segments instead of deleting them. Rollover runs on the logging listener
+    thread, so compression never holds up a request.
+    """
+    def __init__(self, filename, maxBytes, archive_dir=None, **kwargs):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=1, **kwargs)
+        self.archive_dir = archive_dir or Config.LOG_ARCHIVE_DIR
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        # Plain backups left over from the old backupCount, oldest first
+        backups = []
+        depth = 1
+        while os.path.exists(f"{self.baseFilename}.{depth}"):
+            backups.insert(0, f"{self.baseFilename}.{depth}")
+            depth += 1
+
+        for backup in backups:
+            try:
+                archive_segment(backup, self.archive_dir, Config.LOG_ARCHIVE_BLOCK_KB * 1024)
+                os.remove(backup)
+            except OSError as e:
+                # Keep logging even if the archive can't be written
+                logger.error(f"❌ Could not archive {os.path.basename(backup)}: {str(e)}")
+                if os.path.exists(backup):
+                    os.remove(backup)
+
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, self.baseFilename + '.1')
+
+        enforce_retention(self.archive_dir, Config.LOG_ARCHIVE_MAX_MB * 1024 * 1024, Config.LOG_ARCHIVE_MAX_DAYS)
+
+        if not self.delay:
+            self.stream = self._open()
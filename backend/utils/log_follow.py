@@ -0,0 +1,155 @@
+"""
+Following a log file as it grows, for the admin SSE endpoint
+A follower holds a cursor "<inode>:<offset>" and only ever reads bytes past
+it. Log handlers in this process wake followers as soon as a record is
+written; records written by other processes are picked up by polling.
+
+RotatingFileHandler rollover renames app.log to app.log.1 and opens a new
+app.log. A follower notices the inode change, drains what is left of the
+renamed file through its open handle, then continues at the start of the
+new file, so no line is lost or repeated.
+"""
+
+import os
+import time
+import logging
+import threading
+
+BACKUP_SEARCH_DEPTH = 10
+
+
+class ChangeNotifier:
+    """Condition variable that log writers bump and followers wait on"""
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """Block until notify() is called after `generation`; returns the new generation"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+log_changes = ChangeNotifier()
+
+
+class NotifyHandler(logging.Handler):
+    """Added after the file handlers: a record has just been written"""
+    def emit(self, record):
+        log_changes.notify()
+
+
+def format_cursor(inode, offset):
+    return f"{inode}:{offset}"
+
+
+def parse_cursor(cursor):
+    """(inode, offset), or None for a missing or malformed cursor"""
+    try:
+        inode, offset = cursor.split(':')
+        return int(inode), max(0, int(offset))
+    except (AttributeError, ValueError):
+        return None
+
+
+def open_at_cursor(path, cursor):
+    """
+    Files to read for a cursor: [(file, start offset), ...] oldest first
+    If the cursor's inode has been rotated to a backup, the backups after it
+    are included whole, followed by the current file.
+    """
+    current = open(path, 'rb')
+    parsed = parse_cursor(cursor)
+    if parsed is None:
+        return [(current, os.fstat(current.fileno()).st_size)]
+
+    inode, offset = parsed
+    if os.fstat(current.fileno()).st_ino == inode:
+        return [(current, offset)]
+
+    for depth in range(1, BACKUP_SEARCH_DEPTH + 1):
+        backup_path = f"{path}.{depth}"
+        try:
+            if os.stat(backup_path).st_ino != inode:
+                continue
+        except OSError:
+            break
+        chain = [(open(backup_path, 'rb'), offset)]
+        for newer in range(depth - 1, 0, -1):
+            chain.append((open(f"{path}.{newer}", 'rb'), 0))
+        return chain + [(current, 0)]
+
+    # Cursor too old (or from another file): start over at the beginning
+    return [(current, 0)]
+
+
+def read_complete_lines(f, offset, max_bytes):
+    """Whole lines from `offset`; returns (lines, new offset). A partial last line is left for later."""
+    f.seek(offset)
+    data = f.read(max_bytes)
+    end = data.rfind(b'\n')
+    if end == -1:
+        if len(data) < max_bytes:
+            return [], offset
+        # One line longer than a whole read: pass it on in pieces
+        end = len(data) - 1
+    data = data[:end + 1]
+    lines = [line.decode('utf-8', errors='replace') for line in data.splitlines(keepends=True)]
+    return lines, offset + len(data)
+
+
+def follow(path, cursor=None, poll_seconds=1.0, max_seconds=300, heartbeat_seconds=15, max_bytes=256 * 1024):
+    """
+    Generator of (lines, cursor) as `path` grows
+    Yields ([], cursor) as a heartbeat when nothing was written for
+    heartbeat_seconds, and stops after max_seconds so the client reconnects
+    with its last cursor.
+    """
+    chain = open_at_cursor(path, cursor)
+    f, offset = chain.pop(0)
+    deadline = time.monotonic() + max_seconds
+    last_sent = time.monotonic()
+    generation = log_changes.generation
+
+    try:
+        while time.monotonic() < deadline:
+            stats = os.fstat(f.fileno())
+            inode = stats.st_ino
+            if stats.st_size < offset:
+                # Truncated in place
+                offset = 0
+
+            lines, offset = read_complete_lines(f, offset, max_bytes)
+            if lines:
+                last_sent = time.monotonic()
+                yield lines, format_cursor(inode, offset)
+                continue
+
+            # Caught up with this file: move on if it has been rotated away
+            if not chain:
+                try:
+                    rotated = os.stat(path).st_ino != inode
+                except OSError:
+                    rotated = False
+                if rotated:
+                    chain.append((open(path, 'rb'), 0))
+            if chain:
+                f.close()
+                f, offset = chain.pop(0)
+                continue
+
+            if time.monotonic() - last_sent >= heartbeat_seconds:
+                last_sent = time.monotonic()
+                yield [], format_cursor(inode, offset)
+
+            generation = log_changes.wait(generation, poll_seconds)
+    finally:
+        f.close()
+        for pending, _ in chain:
+            pending.close()
@@ -0,0 +1,136 @@
+"""
+Log file reading for the admin endpoints
+Log files grow to several MB, but the admin panel only shows the last
+few hundred lines. tail_lines() seeks backwards from the end in blocks and
+decodes just those lines; LogIndex keeps a persisted running line count so
+totals never need a full scan.
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+
+from config import Config
+
+logger = logging.getLogger('scraping')
+
+BLOCK_SIZE = 64 * 1024
+
+# asctime at the start of a line, in the text formats and in JSON lines
+# ('{"time": "...') alike
+TIMESTAMP_RE = re.compile(rb'^(?:\{"time": ")?(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\d{3}[ "]')
+
+
+def tail_lines(path, count, block_size=BLOCK_SIZE):
+    """Last `count` lines of a file (with their line endings, like readlines)"""
+    if count <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+
+        # One newline more than needed guarantees the first kept line is whole
+        while position > 0 and newlines <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+    data = b''.join(reversed(chunks))
+    lines = data.splitlines(keepends=True)[-count:]
+    return [line.decode('utf-8', errors='replace') for line in lines]
+
+
+def count_newlines(f, start, end, block_size=BLOCK_SIZE):
+    """Newlines between two byte offsets of an open binary file"""
+    f.seek(start)
+    remaining = end - start
+    newlines = 0
+    while remaining > 0:
+        chunk = f.read(min(block_size, remaining))
+        if not chunk:
+            break
+        newlines += chunk.count(b'\n')
+        remaining -= len(chunk)
+    return newlines
+
+
+class PersistedIndex:
+    """
+    Small JSON index shared by every process through one file
+    Subclasses keep their state in self.files and call _load() before
+    reading it and _save() after changing it, holding self.lock.
+    """
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.files = {}
+        self.loaded_mtime = None
+
+    def _load(self):
+        """Re-read the index file if another process has updated it"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self.loaded_mtime:
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f)
+            self.loaded_mtime = mtime
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        try:
+            directory = os.path.dirname(self.index_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            # Write-then-rename so concurrent readers never see a partial index
+            with open(self.index_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(self.files, f)
+            os.replace(self.index_path + '.tmp', self.index_path)
+            self.loaded_mtime = os.stat(self.index_path).st_mtime_ns
+        except OSError as e:
+            # Losing the index only costs a rescan next time
+            logger.warning(f"Could not persist log index: {str(e)}")
+
+
+class LogIndex(PersistedIndex):
+    """
+    Persisted per-file index: {path: {'inode', 'offset', 'lines'}}
+    Each call only reads the bytes appended since the offset last recorded
+    (by any process - the index is a small JSON file). A new inode or a
+    shrunken file means the log was rotated, and the entry starts over.
+    When nothing was appended, a call costs two stats.
+    """
+    def entry(self, path):
+        """Up-to-date index entry for `path` (plus its current size and mtime)"""
+        stats = os.stat(path)
+        with self.lock:
+            self._load()
+            state = self.files.get(path)
+            if state is None or state['inode'] != stats.st_ino or stats.st_size < state['offset']:
+                state = {'inode': stats.st_ino, 'offset': 0, 'lines': 0}
+
+            if stats.st_size > state['offset'] or path not in self.files:
+                with open(path, 'rb') as f:
+                    state['lines'] += count_newlines(f, state['offset'], stats.st_size)
+                state['offset'] = stats.st_size
+                self.files[path] = state
+                self._save()
+
+            return {**state, 'size': stats.st_size, 'mtime': stats.st_mtime}
+
+    def count(self, path):
+        return self.entry(path)['lines']
+
+
+log_index = LogIndex(Config.LOG_INDEX_FILE)
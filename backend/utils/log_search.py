@@ -0,0 +1,285 @@
+"""
+Search over the current and rotated log files
+Every log line starts with its asctime, and files are written in time
+order, so a sparse index of (timestamp, byte offset) samples - one per
+INDEX_STRIDE bytes - is enough to seek close to `since` instead of reading
+a file from the start, and a file that ended before `since` or started
+after `until` is skipped without being opened.
+
+Samples are keyed by inode rather than path: rollover renames app.log to
+app.log.1 without touching its bytes, so the samples stay valid and only
+the newly written part of app.log is ever indexed. Older segments are
+searched in their compressed archives, through the archive's block index
+(utils/log_archive.py).
+"""
+
+import os
+import re
+import bisect
+from collections import deque
+from datetime import datetime
+
+from config import Config
+from utils.log_reader import PersistedIndex, TIMESTAMP_RE
+from utils.log_archive import list_archives, read_blocks
+
+INDEX_STRIDE = 256 * 1024
+SAMPLE_READ_SIZE = 8 * 1024
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+# Matches the detailed ("ts - name - LEVEL - ...") and simple
+# ("ts - LEVEL - ...") formats from logging_config, and JSON lines
+# ('{"time": "ts", "level": "LEVEL", ...') with LOG_FORMAT=json
+RECORD_RE = re.compile(
+    r'^(?:\{"time": ")?(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\d{3}'
+    r'(?: - (?:\S+ - )?|", "level": ")(DEBUG|INFO|WARNING|ERROR|CRITICAL)[ "]'
+)
+
+
+def log_files(path):
+    """A log file and its RotatingFileHandler backups, oldest first"""
+    backups = []
+    depth = 1
+    while os.path.exists(f"{path}.{depth}"):
+        backups.append(f"{path}.{depth}")
+        depth += 1
+    files = list(reversed(backups))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def first_timestamp_after(f, position):
+    """(timestamp, offset) of the first complete timestamped line at or after `position`"""
+    f.seek(position)
+    chunk = f.read(SAMPLE_READ_SIZE)
+    offset = position
+    lines = chunk.split(b'\n')
+    if position > 0:
+        # Land mid-line: skip to the next line start
+        offset += len(lines[0]) + 1
+        lines = lines[1:]
+
+    # The last element is unterminated (or empty): not a complete line
+    for line in lines[:-1]:
+        match = TIMESTAMP_RE.match(line)
+        if match:
+            return match.group(1).decode(), offset
+        offset += len(line) + 1
+    return None
+
+
+class TimeIndex(PersistedIndex):
+    """
+    Sparse timestamp index: {inode: {'log', 'first', 'next', 'samples': [[timestamp, offset], ...]}}
+    'log' is the current file name of the log it belongs to, 'next' the next
+    byte position to sample, and 'first' the file's first timestamp, checked
+    on each update so a reused inode isn't trusted.
+    """
+    def samples(self, path, log_path):
+        """Up-to-date samples for `path` (indexes any bytes written since the last call)"""
+        stats = os.stat(path)
+        key = str(stats.st_ino)
+
+        with self.lock, open(path, 'rb') as f:
+            self._load()
+            entry = self.files.get(key)
+            first = first_timestamp_after(f, 0)
+            first = first and first[0]
+            if entry is None or entry['first'] != first:
+                entry = {'log': log_path, 'first': first, 'next': 0, 'samples': []}
+
+            changed = key not in self.files
+            while entry['next'] < stats.st_size:
+                sample = first_timestamp_after(f, entry['next'])
+                if sample is None and entry['next'] + SAMPLE_READ_SIZE >= stats.st_size:
+                    # Still being written: sample this position next time
+                    break
+                if sample is not None and (not entry['samples'] or sample[1] > entry['samples'][-1][1]):
+                    entry['samples'].append(list(sample))
+                entry['next'] += INDEX_STRIDE
+                changed = True
+
+            if changed:
+                self.files[key] = entry
+                self._save()
+            return entry['samples']
+
+    def prune(self, log_path, live_paths):
+        """Forget a log's files that have been deleted (rotated past backupCount)"""
+        live = set()
+        for path in live_paths:
+            try:
+                live.add(str(os.stat(path).st_ino))
+            except OSError:
+                pass
+        with self.lock:
+            self._load()
+            stale = [key for key, entry in self.files.items() if entry['log'] == log_path and key not in live]
+            if stale:
+                for key in stale:
+                    del self.files[key]
+                self._save()
+
+
+time_index = TimeIndex(Config.LOG_TIME_INDEX_FILE)
+
+
+def start_offset(samples, since):
+    """Offset of the last sample strictly before `since` (every earlier line is too old)"""
+    if not since or not samples:
+        return 0
+    position = bisect.bisect_left([timestamp for timestamp, _ in samples], since)
+    return samples[position - 1][1] if position > 0 else 0
+
+
+def search_file(path, log_path, query, min_level, since, until, limit):
+    """Last `limit` matching records of one plain log file, oldest first; returns (results, bytes scanned)"""
+    if since and datetime.fromtimestamp(os.path.getmtime(path)).strftime(TIMESTAMP_FORMAT) < since:
+        # Last written before the range starts
+        return [], 0
+    samples = time_index.samples(path, log_path)
+    if until and samples and samples[0][0] > until:
+        return [], 0
+
+    with open(path, 'rb') as f:
+        f.seek(start_offset(samples, since))
+        return scan_records(f, query, min_level, since, until, limit)
+
+
+def search_archive(archive_path, index, query, min_level, since, until, limit):
+    """search_file for a compressed archive: only blocks overlapping the range are decompressed"""
+    if (since and index['last'] and index['last'] < since) or (until and index['first'] and index['first'] > until):
+        return [], 0
+    return scan_records(read_blocks(archive_path, index, since, until), query, min_level, since, until, limit)
+
+
+def scan_records(raw_lines, query, min_level, since, until, limit):
+    """
+    Last `limit` matching records from an iterable of log lines (bytes),
+    oldest first; returns (results, bytes scanned)
+    A record is a timestamped line plus any untimestamped lines after it
+    (tracebacks); filters apply to the record as a whole.
+    """
+    results = deque(maxlen=limit)
+    scanned = 0
+    record = None
+
+    def matches(record):
+        timestamp, level, lines = record
+        if min_level and LEVELS.index(level) < LEVELS.index(min_level):
+            return False
+        if since and timestamp < since:
+            return False
+        return not query or query in ''.join(lines).lower()
+
+    for raw_line in raw_lines:
+        scanned += len(raw_line)
+        line = raw_line.decode('utf-8', errors='replace')
+        match = RECORD_RE.match(line)
+        if not match:
+            if record is not None:
+                record[2].append(line)
+            continue
+
+        if record is not None and matches(record):
+            results.append(record)
+
+        timestamp, level = match.groups()
+        if until and timestamp > until:
+            record = None
+            break
+        record = (timestamp, level, [line])
+
+    if record is not None and matches(record):
+        results.append(record)
+    return list(results), scanned
+
+
+def record_dict(log_type, file_path, record):
+    timestamp, level, lines = record
+    return {
+        'log_type': log_type,
+        'file': os.path.basename(file_path),
+        'timestamp': timestamp,
+        'level': level,
+        'lines': lines
+    }
+
+
+def search_log(log_type, path, query, min_level, since, until, limit):
+    """
+    Newest `limit` matching records of one log, newest first
+    Files are searched from the current one back through the backups and
+    archives, and the search stops once `limit` records are found.
+    Returns (results, files searched, bytes scanned).
+    """
+    results = []
+    scanned = 0
+    files_searched = 0
+
+    files = log_files(path)
+    for position in reversed(range(len(files))):
+        if len(results) >= limit:
+            break
+        file_path = files[position]
+        if since and position + 1 < len(files):
+            # Everything in a file is older than the next file's first record
+            newer_samples = time_index.samples(files[position + 1], path)
+            if newer_samples and newer_samples[0][0] < since:
+                break
+        found, file_scanned = search_file(
+            file_path, path, query, min_level, since, until, limit - len(results)
+        )
+        files_searched += 1
+        scanned += file_scanned
+        results += [record_dict(log_type, file_path, record) for record in reversed(found)]
+    time_index.prune(path, files)
+
+    # Archives hold everything older than the plain files
+    for archive_path, index in reversed(list_archives(Config.LOG_ARCHIVE_DIR, os.path.basename(path))):
+        if len(results) >= limit:
+            break
+        found, archive_scanned = search_archive(
+            archive_path, index, query, min_level, since, until, limit - len(results)
+        )
+        files_searched += 1
+        scanned += archive_scanned
+        results += [record_dict(log_type, archive_path, record) for record in reversed(found)]
+
+    return results, files_searched, scanned
+
+
+def search_logs(paths, query=None, min_level=None, since=None, until=None, limit=200):
+    """
+    Search {log_type: path} including rotated backups and compressed archives
+    `since`/`until` are 'YYYY-MM-DD HH:MM:SS' strings (compared as text),
+    `min_level` one of LEVELS. Returns the newest `limit` matches across
+    all log types, newest first.
+    """
+    query = query.lower() if query else None
+    results = []
+    truncated = False
+    scanned = 0
+    files_searched = 0
+
+    for log_type, path in paths.items():
+        found, log_files_searched, log_scanned = search_log(
+            log_type, path, query, min_level, since, until, limit
+        )
+        truncated = truncated or len(found) >= limit
+        files_searched += log_files_searched
+        scanned += log_scanned
+        results += found
+
+    # Stable sort: records with the same timestamp keep their per-log order
+    results.sort(key=lambda result: result['timestamp'], reverse=True)
+    return {
+        'results': results[:limit],
+        'order': 'newest_first',
+        'truncated': truncated or len(results) > limit,
+        'files_searched': files_searched,
+        'bytes_scanned': scanned
+    }
@@ -1,15 +1,145 @@
 """
 Centralized logging configuration for the application
+Loggers only put records on a bounded queue; one listener thread formats
+them and does the file writes and rollovers, so a request never waits on
+disk I/O or the handler lock. When the queue is full the record is
+dropped and counted (see log_queue_stats) rather than blocking.
 """
 import os
+import copy
+import json
+import time
+import uuid
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
+from flask import g, has_request_context, request
+
+from config import Config
+from utils.log_follow import NotifyHandler
+from utils.log_archive import ArchivingRotatingFileHandler
+
+_listener = None
+_queue_handler = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: a full queue drops the record and counts it"""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = {}
+        self.dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Same process, so nothing needs pickling: merge the arguments now
+        # (they may change later) but keep exc_info for the real formatters
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.dropped_lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds request_id and duration_ms (time since the request started) to records"""
+    def filter(self, record):
+        if has_request_context() and 'request_id' in g:
+            record.request_id = g.request_id
+            record.duration_ms = round((time.perf_counter() - g.request_started) * 1000, 1)
+        else:
+            record.request_id = None
+            record.duration_ms = None
+        return True
+
+
+class ExcludeFilter(logging.Filter):
+    """Rejects what logging.Filter(name) would accept"""
+    def filter(self, record):
+        return not super().filter(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line
+    time and level come first, in the same text form as the plain format,
+    so the admin log search reads both.
+    """
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'location': f"{record.filename}:{record.lineno}",
+            'request_id': getattr(record, 'request_id', None),
+            'duration_ms': getattr(record, 'duration_ms', None)
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def start_request_log():
+    """before_request: id for every record logged while handling this request"""
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16]
+    g.request_started = time.perf_counter()
+
+
+def tag_response(response):
+    """after_request: echo the request id so client reports can be matched to logs"""
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+
+def init_request_logging(app):
+    app.before_request(start_request_log)
+    app.after_request(tag_response)
+
+
+def log_queue_stats():
+    """Queue depth and records dropped because the queue was full"""
+    if _queue_handler is None:
+        return {'enabled': False}
+    with _queue_handler.dropped_lock:
+        dropped = dict(_queue_handler.dropped)
+    return {
+        'enabled': True,
+        'queued': _queue_handler.queue.qsize(),
+        'capacity': _queue_handler.queue.maxsize,
+        'dropped': dropped,
+        'dropped_total': sum(dropped.values())
+    }
+
+
+def stop_logging():
+    """Flush what is still queued and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Registered once, not per setup_logging call; a no-op if logging was never set up
+atexit.register(stop_logging)
+
+
 def setup_logging(app):
     """
     Configure logging for both development and production
     """
+    global _listener, _queue_handler
+
     # Create logs directory if it doesn't exist
     if not os.path.exists('logs'):
         os.makedirs('logs')
@@ -22,53 +152,79 @@ def setup_logging(app):
     simple_formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     )
+
+    if Config.LOG_FORMAT == 'json':
+        # JSON lines in the files; the console keeps the readable format
+        detailed_formatter = simple_file_formatter = JsonFormatter()
+    else:
+        simple_file_formatter = simple_formatter
     
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     
     # Remove default handlers to avoid duplicates
+    stop_logging()
     root_logger.handlers.clear()
+    scraping_logger = logging.getLogger('scraping')
+    scraping_logger.handlers.clear()
+
+    # The listener gets every record, so each file handler filters to the
+    # loggers it used to be attached to
+    scraping_only = logging.Filter('scraping')
+    not_scraping = ExcludeFilter('scraping')
     
+    # Rotated segments are compressed into LOG_ARCHIVE_DIR (utils/log_archive.py)
     # 1. General application log (rotating file)
-    app_handler = RotatingFileHandler(
+    app_handler = ArchivingRotatingFileHandler(
         'logs/app.log',
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=10
+        maxBytes=10*1024*1024  # 10MB
     )
     app_handler.setLevel(logging.INFO)
     app_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(app_handler)
+    app_handler.addFilter(not_scraping)
     
     # 2. Scraping-specific log (rotating file)
-    scraping_logger = logging.getLogger('scraping')
-    scraping_handler = RotatingFileHandler(
+    scraping_handler = ArchivingRotatingFileHandler(
         'logs/scraping.log',
-        maxBytes=5*1024*1024,   # 5MB
-        backupCount=5
+        maxBytes=5*1024*1024    # 5MB
     )
     scraping_handler.setLevel(logging.INFO)
-    scraping_handler.setFormatter(simple_formatter)
-    scraping_logger.addHandler(scraping_handler)
+    scraping_handler.setFormatter(simple_file_formatter)
+    scraping_handler.addFilter(scraping_only)
     scraping_logger.setLevel(logging.INFO)
     scraping_logger.propagate = False  # Don't also log to root logger
     
     # 3. Error-only log (for critical issues)
-    error_handler = RotatingFileHandler(
+    error_handler = ArchivingRotatingFileHandler(
         'logs/errors.log',
-        maxBytes=5*1024*1024,   # 5MB
-        backupCount=5
+        maxBytes=5*1024*1024    # 5MB
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_handler)
+    error_handler.addFilter(not_scraping)
+    
+    handlers = [app_handler, scraping_handler, error_handler]
     
     # 4. Console output (for development)
     if app.config.get('ENV') == 'development':
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(simple_formatter)
-        root_logger.addHandler(console_handler)
+        console_handler.addFilter(not_scraping)
+        handlers.append(console_handler)
+    
+    # 5. Wake live log followers once the file handlers above have written
+    handlers.append(NotifyHandler())
+
+    # Loggers only enqueue; the listener thread does all the writing
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=Config.LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(RequestContextFilter())
+    root_logger.addHandler(_queue_handler)
+    scraping_logger.addHandler(_queue_handler)
+
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     app.logger.info("Logging configuration initialized")
 
@@ -0,0 +1,146 @@
+"""
+Rate limiting for auth and admin endpoints
+Token buckets keyed by client IP and by account, with one policy per
+route. The decorator runs before the route body, so a rejected request
+never reaches bcrypt or the database; it gets a 429 with Retry-After.
+
+Buckets live in process memory, spread over independently locked shards
+so concurrent requests rarely wait on each other. With
+RATE_LIMIT_BACKEND=shared, counts go through the shared cache instead
+(fixed windows of the same size), so the limits hold across nodes.
+"""
+
+import math
+import time
+import zlib
+import logging
+import threading
+from functools import wraps
+
+from flask import request, jsonify, g
+
+from config import Config
+from utils.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+# policy -> {key kind: (requests, per seconds)}
+# 'account' is the email in the request body (login/signup) or the
+# authenticated user id (routes behind jwt_required)
+RATE_LIMIT_POLICIES = {
+    'login': {'ip': (20, 60), 'account': (5, 60)},
+    'signup': {'ip': (5, 60), 'account': (3, 3600)},
+    'refresh': {'ip': (30, 60)},
+    'manual_update': {'ip': (10, 60), 'account': (3, 60)},
+}
+
+
+class ShardedBuckets:
+    """
+    Token buckets {key: (tokens, updated_at, full_at)} split across locked shards
+    full_at is when the bucket will have refilled at its own policy's rate,
+    so a sweep triggered by one policy never drops another policy's buckets early.
+    """
+    # Above this many buckets a shard drops the ones that have refilled
+    SWEEP_THRESHOLD = 10000
+
+    def __init__(self, shard_count):
+        self.shards = [({}, threading.Lock()) for _ in range(shard_count)]
+
+    def take(self, key, capacity, refill_per_second):
+        """Spend one token; returns 0 if allowed, else seconds until one is available"""
+        buckets, lock = self.shards[zlib.crc32(key.encode('utf-8')) % len(self.shards)]
+        now = time.monotonic()
+
+        with lock:
+            tokens, updated_at, _ = buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / refill_per_second
+            buckets[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+
+            if len(buckets) > self.SWEEP_THRESHOLD:
+                self._sweep(buckets, now)
+        return wait
+
+    @staticmethod
+    def _sweep(buckets, now):
+        for key in [key for key, (_, _, full_at) in buckets.items() if full_at <= now]:
+            del buckets[key]
+
+
+_buckets = ShardedBuckets(Config.RATE_LIMIT_SHARDS)
+
+
+def take_shared(key, limit, period):
+    """Fixed-window count in the shared cache; same return as ShardedBuckets.take"""
+    now = time.time()
+    window = int(now // period)
+    count = get_cache().incr(f"ratelimit:{key}:{window}", ttl=period)
+    if count is None or count <= limit:
+        # Unreachable cache: fail open rather than locking everyone out
+        return 0.0
+    return (window + 1) * period - now
+
+
+def check_rate_limit(policy_name, keys):
+    """Seconds to wait (0 if allowed) for the given {kind: value} keys"""
+    policy = RATE_LIMIT_POLICIES[policy_name]
+    wait = 0.0
+
+    for kind, value in keys.items():
+        if kind not in policy or value is None:
+            continue
+        limit, period = policy[kind]
+        key = f"{policy_name}:{kind}:{value}"
+
+        if Config.RATE_LIMIT_BACKEND == 'shared':
+            wait = max(wait, take_shared(key, limit, period))
+        else:
+            wait = max(wait, _buckets.take(key, limit, limit / period))
+    return wait
+
+
+def request_keys():
+    """IP and account of the current request"""
+    account = getattr(g, 'current_user_id', None)
+    if account is None and request.is_json:
+        email = (request.get_json(silent=True) or {}).get('email')
+        account = email.strip().lower() if isinstance(email, str) else None
+
+    return {
+        # Client address as seen by the hosting proxy: ProxyFix (app.py) takes
+        # it from the hop the proxy appended, not the client-supplied entries
+        'ip': request.remote_addr,
+        'account': account
+    }
+
+
+def rate_limit(policy_name):
+    """
+    Route decorator applying a RATE_LIMIT_POLICIES entry
+    Put it after @jwt_required so the account key is the user id.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not Config.RATE_LIMIT_ENABLED:
+                return f(*args, **kwargs)
+
+            keys = request_keys()
+            wait = check_rate_limit(policy_name, keys)
+            if wait > 0:
+                retry_after = max(1, math.ceil(wait))
+                logger.warning(f"Rate limit '{policy_name}' hit by {keys} - retry in {retry_after}s")
+                return jsonify({
+                    'error': 'Too many requests, please try again later',
+                    'retry_after': retry_after
+                }), 429, {'Retry-After': str(retry_after)}
+
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
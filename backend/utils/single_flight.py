@@ -0,0 +1,65 @@
+"""
+Single-flight call coalescing
+Concurrent callers asking for the same key share one execution: the first
+caller runs the function, the rest wait for (and return) its result.
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.executions = 0    # calls that actually ran the function
+        self.coalesced = 0     # calls that waited on another caller's run
+
+    def do(self, key, func, stale=None):
+        """
+        Run `func()` once per key across concurrent callers
+        Returns (result, shared); shared is True for callers that didn't run it.
+        If a run is already in progress and `stale` is given, it is returned
+        immediately instead of waiting. Exceptions are re-raised in every waiter.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                if stale is not None:
+                    return stale, True
+                leader = False
+            else:
+                call = self.calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': len(self.calls)
+        }
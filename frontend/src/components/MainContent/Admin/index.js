@@ -1,9 +1,12 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../../../contexts/AuthContext';
 
 import { Navigate } from 'react-router-dom';
 import './Admin.css';
 
+// Lines kept on screen while following a log
+const MAX_FOLLOW_LINES = 1000;
+
 const Admin = () => {
     const { 
         user, 
@@ -13,8 +16,10 @@ const Admin = () => {
         getLogsOverview,
         getSpecificLogs,
         tailLogs,
+        followLogs,
         getSchedulerStatus,
-        triggerManualUpdate
+        triggerManualUpdate,
+        getJobStatus
     } = useAuth();
 
     // State for the dashboard
@@ -25,6 +30,10 @@ const Admin = () => {
     const [error, setError] = useState('');
     const [success, setSuccess] = useState('');
     const [refreshing, setRefreshing] = useState(false);
+    const [following, setFollowing] = useState(false);
+
+    // Aborts the live follow stream
+    const followController = useRef(null);
 
     // Load initial data - useEffect must come before any early returns
     useEffect(() => {
@@ -34,6 +43,17 @@ const Admin = () => {
         }
     }, [loading, user, isAdmin]);
 
+    // Close the follow stream when leaving the logs tab or the page
+    useEffect(() => {
+        if (activeTab !== 'logs' && followController.current) {
+            followController.current.abort();
+            followController.current = null;
+            setFollowing(false);
+        }
+    }, [activeTab]);
+
+    useEffect(() => () => followController.current?.abort(), []);
+
     // If still loading auth, show loading
     if (loading) {
         return (
@@ -75,6 +95,7 @@ const Admin = () => {
     };
 
     const handleLoadSpecificLogs = async (logType, lines = 200) => {
+        stopFollowing();
         try {
             setError('');
             const logData = await getSpecificLogs(logType, lines);
@@ -100,14 +121,73 @@ const Admin = () => {
         }
     };
 
+    const stopFollowing = () => {
+        followController.current?.abort();
+        followController.current = null;
+        setFollowing(false);
+    };
+
+    // Append new lines as they are written, starting after the loaded ones
+    const handleToggleFollow = () => {
+        if (following) {
+            stopFollowing();
+            return;
+        }
+
+        const controller = new AbortController();
+        followController.current = controller;
+        setFollowing(true);
+        setError('');
+
+        const appendLines = (lines) => {
+            setCurrentLogData(prev => ({
+                ...prev,
+                content: [...prev.content, ...lines].slice(-MAX_FOLLOW_LINES)
+            }));
+        };
+
+        followLogs(currentLogData.log_type, currentLogData.metadata?.cursor, appendLines, controller.signal)
+            .catch(err => setError(err.message))
+            .finally(() => {
+                if (followController.current === controller) {
+                    followController.current = null;
+                    setFollowing(false);
+                }
+            });
+    };
+
     const handleManualUpdate = async () => {
         try {
             setError('');
             setSuccess('');
-            await triggerManualUpdate();
-            setSuccess('Manual update triggered successfully!');
-            // Refresh scheduler status after a brief delay
-            setTimeout(loadOverviewData, 1000);
+            const data = await triggerManualUpdate();
+            setSuccess(data.coalesced
+                ? 'Manual update already in progress...'
+                : 'Manual update queued...');
+            pollJob(data.job_id);
+        } catch (err) {
+            setError(err.message);
+        }
+    };
+
+    // Update runs in the background; poll until it finishes
+    const pollJob = async (jobId) => {
+        try {
+            const { job } = await getJobStatus(jobId);
+
+            if (job.state === 'queued' || job.state === 'running') {
+                setSuccess(`Manual update ${job.state} (${job.stage})...`);
+                setTimeout(() => pollJob(jobId), 2000);
+                return;
+            }
+
+            if (job.state === 'succeeded') {
+                setSuccess(`Manual update completed in ${job.duration_seconds}s`);
+            } else {
+                setSuccess('');
+                setError(`Manual update failed: ${job.error}`);
+            }
+            loadOverviewData();
         } catch (err) {
             setError(err.message);
         }
@@ -289,9 +369,16 @@ const Admin = () => {
                             <div className="card-header">
                                 <h2 className="card-title">{currentLogData.title}</h2>
                                 <div className="log-actions">
+                                    <button
+                                        onClick={handleToggleFollow}
+                                        disabled={!currentLogData.success}
+                                        className="refresh-button"
+                                    >
+                                        {following ? 'Stop Live' : 'Live'}
+                                    </button>
                                     <button
                                         onClick={handleRefreshLogs}
-                                        disabled={refreshing}
+                                        disabled={refreshing || following}
                                         className="refresh-button"
                                     >
                                         {refreshing ? 'Refreshing...' : 'Refresh'}
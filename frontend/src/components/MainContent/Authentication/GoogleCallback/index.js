@@ -9,7 +9,7 @@ import { Rankings } from "../../Rankings";
 const GoogleCallback = () => {
 
     const [error, setError] = useState(null);
-    const { setUser, setToken, setOAuthLoading, setLoading } = useAuth();
+    const { saveSession, setOAuthLoading, setLoading } = useAuth();
     const navigate = useNavigate();
     const hasProcessed = useRef(false); // Value persists across renders
 
@@ -50,10 +50,8 @@ const GoogleCallback = () => {
                 // Check the response
                 if (response.ok) {
                     // Regular login
-                    // Take and store user and JWT
-                    setUser(data.user);
-                    setToken(data.token);
-                    localStorage.setItem('token', data.token);
+                    // Take and store user, JWT and refresh token
+                    saveSession(data);
 
                     console.log("Google login succesful");
 
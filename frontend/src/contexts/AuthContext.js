@@ -3,6 +3,7 @@ import React, {
     useContext,
     useState,
     useEffect,
+    useRef,
 } from "react";
  
 // Create the context
@@ -33,6 +34,50 @@ export const AuthProvider = ({ children }) => {
     const BASE_URL = process.env.REACT_APP_BASE_URL || "";
     // console.log("BASE_URL: ", BASE_URL);
 
+    // In-flight refresh, shared so parallel 401s only spend the refresh token once
+    const refreshPromise = useRef(null);
+
+    // Store user, access token and refresh token after any successful auth
+    const saveSession = (data) => {
+        setUser(data.user);
+        setToken(data.token);
+        localStorage.setItem('token', data.token);
+        if (data.refresh_token) {
+            localStorage.setItem('refresh_token', data.refresh_token);
+        }
+    };
+
+    // Trade the stored refresh token for a new access token (null if it fails)
+    const refreshSession = async () => {
+        if (!refreshPromise.current) {
+            refreshPromise.current = (async () => {
+                const refresh_token = localStorage.getItem('refresh_token');
+                if (!refresh_token) return null;
+
+                try {
+                    const response = await fetch(`${BASE_URL}/api/auth/refresh`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ refresh_token })
+                    });
+                    if (!response.ok) {
+                        localStorage.removeItem('refresh_token');
+                        return null;
+                    }
+                    const data = await response.json();
+                    saveSession(data);
+                    return data.token;
+                } catch (error) {
+                    console.error('Token refresh failed:', error);
+                    return null;
+                } finally {
+                    refreshPromise.current = null;
+                }
+            })();
+        }
+        return refreshPromise.current;
+    };
+
     // Helper function for authenticated API calls
     const makeAuthenticatedRequest = async (url, options = {}) => {
         console.log('🔍 Making request to:', `${BASE_URL}${url}`);
@@ -51,14 +96,28 @@ export const AuthProvider = ({ children }) => {
             },
         };
 
-        const response = await fetch(`${BASE_URL}${url}`, {
+        let response = await fetch(`${BASE_URL}${url}`, {
             ...defaultOptions,
             ...options,
         });
 
+        if (response.status === 401) {
+            // Access token expired: refresh once and retry
+            const newToken = await refreshSession();
+            if (newToken) {
+                response = await fetch(`${BASE_URL}${url}`, {
+                    ...options,
+                    headers: {
+                        ...defaultOptions.headers,
+                        'Authorization': `Bearer ${newToken}`,
+                    },
+                });
+            }
+        }
+
         if (!response.ok) {
             if (response.status === 401) {
-                // Token expired, logout user
+                // Refresh failed too, logout user
                 logout();
                 throw new Error('Authentication expired. Please log in again.');
             }
@@ -93,8 +152,8 @@ export const AuthProvider = ({ children }) => {
                         const data = await response.json();
                         setUser(data.user);
                         setToken(stored_token);
-                    } else {
-                        // Token is invalid, remove it
+                    } else if (!(await refreshSession())) {
+                        // Token is invalid and can't be refreshed, remove it
                         localStorage.removeItem('token');
                     }
                 } catch (error) {
@@ -144,9 +203,7 @@ export const AuthProvider = ({ children }) => {
             const data = await response.json();
 
             if (response.ok) {
-                setUser(data.user);
-                setToken(data.token);
-                localStorage.setItem('token', data.token);
+                saveSession(data);
                 return { success: true, data };
             } else {
                 return { success: false, error: data.error };
@@ -173,9 +230,7 @@ export const AuthProvider = ({ children }) => {
             const data = await response.json();
 
             if (response.ok) {
-                setUser(data.user);
-                setToken(data.token);
-                localStorage.setItem('token', data.token);
+                saveSession(data);
                 return { success: true, data };
             } else {
                 return { success: false, error: data.error };
@@ -188,9 +243,28 @@ export const AuthProvider = ({ children }) => {
     }
 
     const logout = async () => {
+        const refresh_token = localStorage.getItem('refresh_token');
+        const access_token = localStorage.getItem('token');
+
         setUser(null);
         setToken(null);
         localStorage.removeItem('token');
+        localStorage.removeItem('refresh_token');
+
+        // End the session server-side: the refresh token can't be reused and
+        // the access token (sent as Bearer) is revoked before it expires
+        if (refresh_token || access_token) {
+            const headers = { 'Content-Type': 'application/json' };
+            if (access_token) {
+                headers['Authorization'] = `Bearer ${access_token}`;
+            }
+
+            fetch(`${BASE_URL}/api/auth/logout`, {
+                method: 'POST',
+                headers,
+                body: JSON.stringify({ refresh_token })
+            }).catch((error) => console.error('Logout request failed:', error));
+        }
     }
 
     // ADMIN FUNCTIONS
@@ -224,6 +298,71 @@ export const AuthProvider = ({ children }) => {
         }
     };
 
+    // Follow a log over SSE from `cursor`, calling onLines with each batch
+    // EventSource can't send the Authorization header, so the stream is read
+    // through fetch. Runs until `signal` is aborted.
+    const followLogs = async (logType, cursor, onLines, signal) => {
+        let accessToken = localStorage.getItem('token') || token;
+        let refreshed = false;
+
+        while (!signal.aborted) {
+            const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+            let response;
+            try {
+                response = await fetch(`${BASE_URL}/admin/logs/${logType}/follow${query}`, {
+                    headers: { 'Authorization': `Bearer ${accessToken}` },
+                    signal
+                });
+            } catch (error) {
+                if (signal.aborted) return;
+                throw error;
+            }
+
+            if (response.status === 401 && !refreshed) {
+                // Access token expired: refresh once and reconnect
+                refreshed = true;
+                accessToken = await refreshSession();
+                if (accessToken) continue;
+            }
+            if (!response.ok) {
+                if (response.status === 401) {
+                    logout();
+                    throw new Error('Authentication expired. Please log in again.');
+                }
+                throw new Error(`Log follow failed: ${response.statusText}`);
+            }
+            refreshed = false;
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            try {
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+
+                    // Events are separated by a blank line; comments (": ...") are heartbeats
+                    let end;
+                    while ((end = buffer.indexOf('\n\n')) !== -1) {
+                        const event = buffer.slice(0, end);
+                        buffer = buffer.slice(end + 2);
+                        let data = null;
+                        for (const line of event.split('\n')) {
+                            if (line.startsWith('id: ')) cursor = line.slice(4);
+                            else if (line.startsWith('data: ')) data = line.slice(6);
+                        }
+                        if (data) onLines(JSON.parse(data).lines);
+                    }
+                }
+            } catch (error) {
+                if (signal.aborted) return;
+                throw error;
+            }
+            // The server ends the stream after LOG_FOLLOW_MAX_SECONDS: resume from the last cursor
+        }
+    };
+
     const getSchedulerStatus = async () => {
         setAdminLoading(true);
         try {
@@ -238,7 +377,9 @@ export const AuthProvider = ({ children }) => {
     const triggerManualUpdate = async () => {
         setAdminLoading(true);
         try {
-            return await makeAuthenticatedRequest('/admin/trigger-manual-update');
+            return await makeAuthenticatedRequest('/admin/trigger-manual-update', {
+                method: 'POST'
+            });
         } catch (error) {
             throw error;
         } finally {
@@ -246,6 +387,14 @@ export const AuthProvider = ({ children }) => {
         }
     };
 
+    const getJobStatus = async (jobId) => {
+        try {
+            return await makeAuthenticatedRequest(`/admin/jobs/${jobId}`);
+        } catch (error) {
+            throw error;
+        }
+    };
+
     // THIS IS WHAT COMPONENTS CAN ACCESS
     const value = {
         // Existing auth values
@@ -258,6 +407,8 @@ export const AuthProvider = ({ children }) => {
         login,
         signup,
         logout,
+        saveSession,
+        refreshSession,
         loginWithGoogle,
         signupWithGoogle,
         oAuthLoading,
@@ -271,8 +422,10 @@ export const AuthProvider = ({ children }) => {
         getLogsOverview,
         getSpecificLogs,
         tailLogs,
+        followLogs,
         getSchedulerStatus,
         triggerManualUpdate,
+        getJobStatus,
     };
 
     return (